@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Ressources distantes (logo, polices, nuanciers) servies depuis un cache local.
+
+Les ressources manquantes sont téléchargées en parallèle (asyncio + pool de
+connexions requests avec reprises) ; une fois le cache chaud, tout fonctionne
+hors ligne. Les polices sont copiées dans un dossier servi en statique par
+Streamlit : la page ne reçoit qu'une petite feuille @font-face qui y renvoie.
+"""
+import asyncio
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "nuancier_assets"
+
+# (connexion, lecture) : un hôte injoignable ne bloque jamais plus de quelques secondes
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Google Fonts ne sert le woff2 qu'aux navigateurs récents
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+_FONT_FACE_RE = re.compile(r"(?:/\*\s*([\w-]+)\s*\*/\s*)?@font-face\s*\{(.*?)\}", re.S)
+_CSS_PROP_RE = re.compile(r"([\w-]+)\s*:\s*([^;]+);")
+_CSS_URL_RE = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+
+def _cache_name(url: str) -> str:
+    suffix = Path(urlparse(url).path).suffix[:8]
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + suffix
+
+
+_FONT_FORMATS = {".woff2": "woff2", ".woff": "woff", ".ttf": "truetype", ".otf": "opentype"}
+
+# Le serveur statique déduit le Content-Type de l'extension
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("font/woff", ".woff")
+
+
+def data_uri(path, default_mime="application/octet-stream") -> str:
+    path = Path(path)
+    mime = mimetypes.guess_type(path.name)[0] or default_mime
+    return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode('utf-8')}"
+
+
+class AssetService:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, retries: int = 1, timeout=DEFAULT_TIMEOUT,
+                 max_concurrency: int = 8, session=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.session = session or self._make_session(retries, max_concurrency)
+
+    @staticmethod
+    def _make_session(retries, pool_size):
+        session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = BROWSER_USER_AGENT
+        return session
+
+    # =========================
+    # Cache
+    # =========================
+    def cache_path(self, url: str) -> Path:
+        return self.cache_dir / _cache_name(url)
+
+    def cached(self, url: str):
+        """Chemin local si la ressource est déjà en cache, sinon None."""
+        path = self.cache_path(url)
+        return path if path.exists() else None
+
+    def _download(self, url: str) -> Path:
+        resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        path = self.cache_path(url)
+        # Écriture atomique : un fichier partiel n'est jamais pris pour une entrée du cache
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(resp.content)
+        os.replace(tmp, path)
+        return path
+
+    def fetch(self, url: str) -> Path:
+        """Chemin local de `url`, téléchargé s'il manque ; lève OSError en cas d'échec."""
+        return self.cached(url) or self._download(url)
+
+    async def fetch_many(self, urls):
+        """Télécharge en parallèle les URLs absentes du cache ; {url: chemin ou exception}."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(url):
+            path = self.cached(url)
+            if path is not None:
+                return path
+            async with semaphore:
+                return await asyncio.to_thread(self._download, url)
+
+        urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(one(u) for u in urls), return_exceptions=True)
+        return dict(zip(urls, results))
+
+    def warm(self, urls):
+        """Version synchrone de fetch_many, pour le script Streamlit."""
+        return asyncio.run(self.fetch_many(urls))
+
+    # =========================
+    # Polices
+    # =========================
+    def font_stylesheet(self, css_url: str) -> Path:
+        return self.cache_path(css_url).with_suffix(".faces.css")
+
+    def cached_font_css(self, css_url: str):
+        """Feuille @font-face déjà construite, sans accès réseau ; None si absente."""
+        path = self.font_stylesheet(css_url)
+        return path.read_text(encoding="utf-8") if path.exists() else None
+
+    def font_css(self, css_url: str, url_prefix: str, subsets=("latin", "latin-ext")):
+        """Construit la feuille @font-face pointant vers `url_prefix` ; None si indisponible.
+
+        Les fichiers de police sont téléchargés dans le dossier du cache, que
+        l'appli sert sous `url_prefix`. Seuls les sous-ensembles `subsets` sont
+        gardés, et les graisses qui partagent un même fichier (polices
+        variables) sont fusionnées en une plage.
+        """
+        stylesheet = self.font_stylesheet(css_url)
+        if stylesheet.exists():
+            return stylesheet.read_text(encoding="utf-8")
+
+        css_path = self.warm([css_url])[css_url]
+        if isinstance(css_path, Exception):
+            return None
+
+        faces = {}
+        for subset, body in _FONT_FACE_RE.findall(css_path.read_text(encoding="utf-8")):
+            if subset and subset not in subsets:
+                continue
+            props = dict(_CSS_PROP_RE.findall(body))
+            m = _CSS_URL_RE.search(props.get("src", ""))
+            if not m:
+                continue
+            font_url = urljoin(css_url, m.group(1))
+            key = (props.get("font-family"), props.get("font-style", "normal"), font_url)
+            face = faces.setdefault(key, {"weights": set(), "props": props})
+            face["weights"].update(int(w) for w in re.findall(r"\d+", props.get("font-weight", "400")))
+
+        fonts = self.warm([key[2] for key in faces])
+        if any(isinstance(p, Exception) for p in fonts.values()):
+            return None
+
+        blocks = []
+        for (family, style, font_url), face in faces.items():
+            weights = sorted(face["weights"]) or [400]
+            weight = str(weights[0]) if len(weights) == 1 else f"{weights[0]} {weights[-1]}"
+            extra = "".join(
+                f"  {name}: {face['props'][name]};\n"
+                for name in ("font-display", "unicode-range") if name in face["props"]
+            )
+            fmt = _FONT_FORMATS.get(fonts[font_url].suffix, "woff2")
+            blocks.append(
+                "@font-face {\n"
+                f"  font-family: {family};\n"
+                f"  font-style: {style};\n"
+                f"  font-weight: {weight};\n"
+                f"  src: url('{url_prefix}/{fonts[font_url].name}') format('{fmt}');\n"
+                f"{extra}}}\n"
+            )
+        css = "".join(blocks)
+        # Écrite en dernier : sa présence signale que toutes les polices sont en place
+        stylesheet.write_text(css, encoding="utf-8")
+        return css
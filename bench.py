@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmarks des briques de calcul (hors Streamlit).
+
+Usage : python bench.py [nom ...]   (sans argument : tous les benchmarks)
+"""
+import random
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import ncs
+import scoring
+import search
+
+BENCHMARKS = {}
+
+def benchmark(func):
+    BENCHMARKS[func.__name__.removeprefix("bench_")] = func
+    return func
+
+def _timed(label, func, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = func(*args)
+        best = min(best, time.perf_counter() - t0)
+    print(f"  {label:<44} {best * 1000:10.1f} ms")
+    return out
+
+_NEXT_HUE = {"Y": "R", "R": "B", "B": "G", "G": "Y"}
+
+def _edge_ncs_code(rng):
+    """Code limite, lu différemment par l'ancien et le nouvel analyseur (cf. golden.py)."""
+    a = rng.choice("YRBG")
+    s = rng.randrange(0, 95, 5)
+    c = rng.randrange(5, min(95, 100 - s) + 1, 5) if s < 95 else 5
+    shape = rng.randrange(6)
+    if shape == 0:      # teinte non adjacente (« Y50B »)
+        opposite = _NEXT_HUE[_NEXT_HUE[a]]
+        return f"S{s:02d}{c:02d}-{a}{rng.randrange(10, 100, 10)}{opposite}"
+    if shape == 1:      # noirceur + chromaticité > 100 (« S6060-Y »)
+        s = rng.randrange(50, 95, 5)
+        return f"S{s:02d}{rng.randrange(105 - s, 100, 5):02d}-{a}"
+    if shape == 2:      # pourcentage de teinte nul (« R0B »)
+        return f"S{s:02d}{c:02d}-{a}0{_NEXT_HUE[a]}"
+    if shape == 3:      # lettre hors RGBY (« S1020-X »)
+        return f"S{s:02d}{c:02d}-{rng.choice('XWS')}"
+    if shape == 4:      # gris neutre avec chromaticité (« S0510-N »)
+        return f"S{s:02d}{c:02d}-N"
+    # minuscules (« s1050-y90r »)
+    return f"s{s:02d}{c:02d}-{a}{rng.randrange(10, 100, 10)}{_NEXT_HUE[a]}".lower()
+
+def random_ncs_codes(n, seed=0, invalid_ratio=0.0, edge_ratio=0.0):
+    """`invalid_ratio` : codes illisibles ; `edge_ratio` : codes limites (_edge_ncs_code)."""
+    rng = random.Random(seed)
+    # « N » seulement à chromaticité nulle : « S0510-N » est un code limite
+    hues = ["Y", "R", "B", "G"] + [
+        f"{a}{p}{b}" for a, b in (("Y", "R"), ("R", "B"), ("B", "G"), ("G", "Y"))
+        for p in range(10, 100, 10)
+    ]
+    codes = []
+    for _ in range(n):
+        if rng.random() < invalid_ratio:
+            codes.append(f"X{rng.randrange(10000):04d}-Q")
+            continue
+        if rng.random() < edge_ratio:
+            codes.append(_edge_ncs_code(rng))
+            continue
+        s = rng.randrange(0, 95, 5)
+        c = rng.randrange(0, min(95, 100 - s) + 1, 5)
+        hue = rng.choice(hues)
+        codes.append(f"S{s:02d}{c:02d}-{'N' if c == 0 else hue}")
+    return codes
+
+def synthetic_catalog(n, seed=0):
+    """Nuancier NCS synthétique au schéma de palette_ncs_avec_adjectifs.csv."""
+    rng = np.random.default_rng(seed)
+    codes = random_ncs_codes(n, seed=seed)
+    parsed = [ncs.parse_ncs(c) for c in codes]
+    names = np.array(["Olive", "Jaune vert", "Rouge brique", "Bleu canard", "Gris perle",
+                      "Vert d'eau", "Ocre", "Rose poudré", "Lavande", "Terre de Sienne"])
+    return pd.DataFrame({
+        "ncs_code": codes,
+        "nom": names[rng.integers(0, len(names), n)],
+        "noirceur%": [p.blackness for p in parsed],
+        "saturation%": [p.chroma for p in parsed],
+        "teinte": [p.hue for p in parsed],
+        "temperature": rng.choice(["chaud", "froid", "neutre"], n),
+        "luminosite": rng.choice(["lumineux", "mat"], n),
+        "clarte": rng.choice(["clair", "foncé"], n),
+        "is_neutre": [int(p.is_neutral) for p in parsed],
+    })
+
+# =========================
+# Analyse NCS
+# =========================
+_LEGACY_RE = r"^S(\d{2})(\d{2})-([A-Z](?:\d{1,2}[A-Z])?|N)$"
+
+def _legacy_parse(codes):
+    # Chemin historique : re.match avec motif chaîne à chaque appel
+    return [re.match(_LEGACY_RE, (c or "").replace(" ", "")) for c in codes]
+
+def _parse_all(codes):
+    return [ncs.parse_ncs(c) for c in codes]
+
+@benchmark
+def bench_parse(n=1_000_000):
+    codes = random_ncs_codes(n, invalid_ratio=0.01)
+    print(f"Analyse de {n:,} codes NCS ({len(set(codes)):,} distincts)")
+    _timed("re.match par appel (historique)", _legacy_parse, codes)
+    ncs._PARSED.clear()
+    _timed("parse_ncs, table froide", _parse_all, codes)
+    _timed("parse_ncs, table chaude", _parse_all, codes)
+    report = _timed("validate_codes", ncs.validate_codes, codes)
+    print(f"  -> {len(report.invalid):,} invalides, {len(report.duplicates):,} doublons")
+    _timed("ncs_to_rgb", lambda cs: [ncs.ncs_to_rgb(c) for c in cs], codes)
+
+# =========================
+# Conversion NCS -> RGB
+# =========================
+@benchmark
+def bench_conversion(n=200_000):
+    codes = [ncs.parse_ncs(c) for c in random_ncs_codes(n)]
+    print(f"Conversion de {n:,} codes NCS")
+    ncs.build_ncs_lut.cache_clear()
+    _timed("construction de la table NCS", ncs.build_ncs_lut)
+    _timed("approx, calcul par ligne (sans mémo)",
+           lambda cs: [ncs._ncs_code_to_rgb.__wrapped__(c) for c in cs], codes)
+    _timed("approx, mémoïsé", ncs.ncs_codes_to_rgb, codes, "approx")
+    _timed("table NCS, trilinéaire vectorisée", ncs.ncs_codes_to_rgb, codes, "lut")
+
+# =========================
+# Classement pondéré
+# =========================
+@benchmark
+def bench_ranking(n=100_000):
+    df = synthetic_catalog(n)
+    print(f"Classement pondéré sur {n:,} couleurs")
+    _timed("référence par ligne (3 x DataFrame.apply)",
+           lambda d: [d.apply(lambda r: scoring.score_adjective(r, a), axis=1)
+                      for a in ("chaud", "clair", "lumineux")], df)
+    matrix = _timed("matrice des notes (une fois par nuancier)", scoring.adjective_score_matrix, df)
+    bonus = scoring.saturation_bonus(df)
+
+    rng = np.random.default_rng(1)
+    weights = [scoring.weight_vector(("chaud", "clair", "lumineux"), rng.random(3)) for _ in range(50)]
+    _timed("re-classement (un mouvement de curseur)",
+           lambda: [scoring.rank_weighted(matrix, w, bonus, 0.6, 144) for w in weights[:1]], repeat=20)
+    t0 = time.perf_counter()
+    for w in weights:
+        scoring.rank_weighted(matrix, w, bonus, 0.6, 144)
+    print(f"  {'moyenne sur 50 mouvements':<44} {(time.perf_counter() - t0) / 50 * 1000:10.2f} ms")
+
+# =========================
+# Recherche plein texte
+# =========================
+SEARCH_QUERIES = ["jaune chaud S05", "olive", "S10-30 bleu", "y50r mat", "ver", "rose poudre clair S20"]
+
+@benchmark
+def bench_search(sizes=(100_000, 500_000)):
+    for n in sizes:
+        df = synthetic_catalog(n)
+        print(f"Recherche sur {n:,} couleurs")
+        index = _timed("construction de l'index", search.SearchIndex, df)
+        print(f"  -> {len(index.postings):,} mots, {index.nbytes / 1e6:.1f} Mo")
+        scores = np.random.default_rng(0).random(n)
+        for q in SEARCH_QUERIES:
+            positions, relevance = _timed(f"requête « {q} »", index.query, q, repeat=5)
+            search.rank_results(positions, relevance, scores)
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
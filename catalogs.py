@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Registre des nuanciers : chargement, index en cache et requêtes croisées."""
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from colorspace import rgb_to_lab
+from families import FamilyOrder
+from harmonies import HueIndex
+from ncs import ncs_codes_to_rgb, rgb_to_hex, hex_to_rgb, validate_codes, _rgb_to_hsv_tuple
+from scoring import adjective_score_matrix
+from search import SearchIndex
+
+REQUIRED_COLUMNS = {
+    "ncs_code", "nom", "noirceur%", "saturation%", "teinte",
+    "temperature", "clarte", "luminosite", "is_neutre"
+}
+
+# =========================
+# Loaders
+# =========================
+# Chaque loader reçoit un chemin et le mode de conversion NCS (cf. ncs.CONVERSIONS),
+# et renvoie un DataFrame au schéma commun :
+# REQUIRED_COLUMNS + "rgb" (tuple 0-255) + "hex". La colonne "ncs_code" sert
+# d'identifiant de couleur, même pour les nuanciers qui ne sont pas NCS.
+# Un loader peut signaler des anomalies de chargement dans df.attrs["issues"].
+
+def _preview(codes, limit=5):
+    shown = ", ".join(str(c) for c in codes[:limit])
+    return shown + (" ..." if len(codes) > limit else "")
+
+def load_ncs_csv(path, conversion="approx") -> pd.DataFrame:
+    df = pd.read_csv(path, sep=";")
+    missing = REQUIRED_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {path} : {', '.join(sorted(missing))}")
+
+    # Validation en bloc : les codes illisibles ne doivent pas finir en gris
+    # dans « Tons neutres », et un même code ne doit apparaître qu'une fois.
+    report = validate_codes(df["ncs_code"].tolist())
+    issues = []
+    if report.invalid:
+        issues.append(f"{len(report.invalid)} code(s) NCS invalide(s) ignoré(s) : {_preview(report.invalid)}")
+    if report.duplicates:
+        issues.append(f"{len(report.duplicates)} doublon(s) ignoré(s) : {_preview(report.duplicates)}")
+
+    parsed = pd.Series(report.parsed, index=df.index, dtype=object)
+    keep = parsed.notna()
+    df = df.loc[keep].copy()
+    parsed = parsed.loc[keep]
+    df["ncs_code"] = parsed.map(str)
+    keep = ~df["ncs_code"].duplicated()
+    df = df.loc[keep].reset_index(drop=True)
+    parsed = parsed.loc[keep].reset_index(drop=True)
+
+    df["nom"] = df["nom"].fillna("").astype(str)
+    df["rgb"] = ncs_codes_to_rgb(parsed.tolist(), conversion)
+    df["hex"] = df["rgb"].apply(rgb_to_hex)
+    df.attrs["issues"] = issues
+    return df
+
+def load_hex_csv(path, conversion="approx") -> pd.DataFrame:
+    """Nuancier HEX + trois adjectifs (température, clarté, luminosité)."""
+    raw = pd.read_csv(path, sep=";", dtype=str)
+    required = {"hex_code", "adjectif1", "adjectif2", "adjectif3"}
+    missing = required - set(raw.columns)
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {path} : {', '.join(sorted(missing))}")
+
+    rgb = raw["hex_code"].apply(hex_to_rgb)
+    hsv = np.array([_rgb_to_hsv_tuple(c) for c in rgb]).reshape(-1, 3)
+
+    df = pd.DataFrame({
+        "ncs_code": rgb.apply(rgb_to_hex),
+        "nom": "",
+        "noirceur%": np.rint((1.0 - hsv[:, 2]) * 100).astype(int),
+        "saturation%": np.rint(hsv[:, 1] * 100).astype(int),
+        "teinte": "",
+        "temperature": raw["adjectif1"].fillna("").str.strip().str.lower(),
+        "clarte": raw["adjectif2"].fillna("").str.strip().str.lower(),
+        "luminosite": raw["adjectif3"].fillna("").str.strip().str.lower(),
+        "is_neutre": (hsv[:, 1] < 0.05).astype(int),
+    })
+    df["rgb"] = rgb
+    df["hex"] = df["ncs_code"]
+    return df
+
+LOADERS = {
+    "ncs": load_ncs_csv,
+    "hex": load_hex_csv,
+}
+
+# =========================
+# Catalogues
+# =========================
+class CatalogIndex:
+    """Index d'un nuancier : tableaux contigus pour les requêtes vectorisées."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.codes = frame["ncs_code"].to_numpy(dtype=object)
+        self.rgb = np.array(frame["rgb"].tolist(), dtype=np.uint8).reshape(-1, 3)
+        self.lab = rgb_to_lab(self.rgb).astype(np.float32)
+        self.position = {code: i for i, code in enumerate(self.codes)}
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rgb.nbytes + self.lab.nbytes + self.codes.nbytes)
+
+
+class Catalog:
+    """Nuancier chargé à la demande ; la table et l'index sont calculés une seule fois.
+
+    `fetch` (facultatif) rapatrie `path` s'il manque : un téléchargement
+    échoué est retenté au chargement suivant au lieu de rester en cache.
+    """
+
+    def __init__(self, name: str, path, kind: str, conversion: str = "approx", fetch=None):
+        if kind not in LOADERS:
+            raise ValueError(f"Type de nuancier inconnu : {kind}")
+        self.name = name
+        self.path = Path(path)
+        self.kind = kind
+        self.conversion = conversion
+        self.fetch = fetch
+        self._frame = None
+        self._index = None
+        self._scores = None
+        self._search_index = None
+        self._family_order = None
+        self._hue_index = None
+        self.issues = []
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    if self.fetch is not None and not self.path.exists():
+                        self.fetch()
+                    frame = LOADERS[self.kind](self.path, self.conversion)
+                    self.issues = frame.attrs.pop("issues", [])
+                    self._frame = frame
+        return self._frame
+
+    @property
+    def index(self) -> CatalogIndex:
+        if self._index is None:
+            frame = self.frame
+            with self._lock:
+                if self._index is None:
+                    self._index = CatalogIndex(frame)
+        return self._index
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Notes de chaque couleur pour chaque adjectif (cf. scoring.ADJECTIVES)."""
+        if self._scores is None:
+            frame = self.frame
+            with self._lock:
+                if self._scores is None:
+                    self._scores = adjective_score_matrix(frame)
+        return self._scores
+
+    @property
+    def search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            frame = self.frame
+            with self._lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex(frame)
+        return self._search_index
+
+    @property
+    def family_order(self) -> FamilyOrder:
+        if self._family_order is None:
+            frame = self.frame
+            with self._lock:
+                if self._family_order is None:
+                    self._family_order = FamilyOrder(frame)
+        return self._family_order
+
+    @property
+    def hue_index(self) -> HueIndex:
+        """Couleurs chromatiques triées par teinte, pour les harmonies."""
+        if self._hue_index is None:
+            family_order = self.family_order
+            with self._lock:
+                if self._hue_index is None:
+                    self._hue_index = HueIndex(family_order.hsv[:, 0] * 360.0, family_order.famille != "grey")
+        return self._hue_index
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._frame is not None
+
+    def memory_bytes(self) -> int:
+        total = 0
+        if self._frame is not None:
+            total += int(self._frame.memory_usage(deep=True).sum())
+        if self._index is not None:
+            total += self._index.nbytes
+        if self._scores is not None:
+            total += int(self._scores.nbytes)
+        if self._search_index is not None:
+            total += self._search_index.nbytes
+        if self._family_order is not None:
+            total += self._family_order.nbytes
+        if self._hue_index is not None:
+            total += self._hue_index.nbytes
+        return total
+
+
+class CatalogRegistry:
+    def __init__(self, conversion: str = "approx"):
+        self.conversion = conversion
+        self._catalogs = {}
+
+    def register(self, name: str, path, kind: str, fetch=None) -> Catalog:
+        catalog = Catalog(name, path, kind, self.conversion, fetch)
+        self._catalogs[name] = catalog
+        return catalog
+
+    def get(self, name: str) -> Catalog:
+        return self._catalogs[name]
+
+    def names(self):
+        return list(self._catalogs)
+
+    def memory_report(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "nuancier": c.name,
+                "chargé": c.is_loaded,
+                "lignes": len(c._frame) if c.is_loaded else 0,
+                "mémoire (Ko)": round(c.memory_bytes() / 1024, 1),
+            }
+            for c in self._catalogs.values()
+        ])
+
+# =========================
+# Requêtes croisées
+# =========================
+def nearest_in_catalog(rgb, target: Catalog, batch_size: int = 2048):
+    """Pour chaque couleur de `rgb` (n, 3), position et ΔE76 de la plus proche dans `target`.
+
+    Les distances sont calculées par blocs pour borner la mémoire à
+    batch_size x len(target) flottants.
+    """
+    src = rgb_to_lab(np.asarray(rgb).reshape(-1, 3)).astype(np.float32)
+    ref = target.index.lab
+    ref_sq = np.einsum("ij,ij->i", ref, ref)
+
+    positions = np.empty(len(src), dtype=np.int64)
+    distances = np.empty(len(src), dtype=np.float32)
+    for start in range(0, len(src), batch_size):
+        block = src[start:start + batch_size]
+        d2 = (
+            np.einsum("ij,ij->i", block, block)[:, None]
+            + ref_sq[None, :]
+            - 2.0 * block @ ref.T
+        )
+        best = d2.argmin(axis=1)
+        positions[start:start + batch_size] = best
+        distances[start:start + batch_size] = np.sqrt(
+            np.maximum(d2[np.arange(len(block)), best], 0.0)
+        )
+    return positions, distances
+
+def cross_catalog_matches(source: pd.DataFrame, target: Catalog) -> pd.DataFrame:
+    """Meilleure correspondance dans `target` pour chaque couleur de `source`."""
+    if source.empty:
+        return pd.DataFrame(columns=["ncs_code", "hex", "code_cible", "hex_cible", "delta_e"])
+
+    rgb = np.array(source["rgb"].tolist(), dtype=np.uint8)
+    positions, distances = nearest_in_catalog(rgb, target)
+    matched = target.frame.iloc[positions]
+    return pd.DataFrame({
+        "ncs_code": source["ncs_code"].to_numpy(),
+        "hex": source["hex"].to_numpy(),
+        "code_cible": matched["ncs_code"].to_numpy(),
+        "hex_cible": matched["hex"].to_numpy(),
+        "delta_e": np.round(distances.astype(np.float64), 2),
+    })
@@ -1,18 +1,31 @@
 # -*- coding: utf-8 -*-
-import re
 import math
-import colorsys
 import base64
-import tempfile
+import threading
+from functools import partial
 from io import BytesIO
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
-import requests
 from fpdf import FPDF
 
+from assets import AssetService, DEFAULT_CACHE_DIR, data_uri
+from ncs import CONVERSIONS, ncs_to_rgb
+from catalogs import CatalogRegistry, cross_catalog_matches
+from families import (
+    PDF_LABEL_GAP, PDF_LABEL_H, PDF_MARGIN, PDF_SWATCH_H, PDF_SWATCH_W, pdf_page_layout
+)
+from harmonies import HARMONIES, HueIndex
+from search import rank_results
+from scoring import (
+    ADJECTIVES, best_family_alternatives, rank_weighted, saturation_bonus, select_strict,
+    weight_vector
+)
+from session import SessionStateManager
+
 # =========================
 # App config
 # =========================
@@ -56,6 +69,40 @@ def check_password():
 if not check_password():
     st.stop()
 
+# =========================
+# Ressources distantes (cache local)
+# =========================
+FONTS_CSS_URL = (
+    "https://fonts.googleapis.com/css2?family=Abril+Fatface"
+    "&family=Montserrat:wght@300;400;500;600&family=Nunito:wght@400;600;700&display=swap"
+)
+
+@st.cache_resource
+def get_assets():
+    return AssetService(st.secrets.get("ASSET_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+# Polices servies en statique par Streamlit (server.enableStaticServing, .streamlit/config.toml)
+FONT_DIR = Path(__file__).parent / "static" / "fonts"
+FONT_URL_PREFIX = "app/static/fonts"
+
+@st.cache_resource
+def get_font_assets():
+    return AssetService(FONT_DIR)
+
+# Toutes les 10 min au plus, un téléchargement manquant est relancé hors du rendu :
+# le script ne lit que ce qui est déjà en cache et n'attend jamais le réseau
+ASSET_RETRY_TTL = 600
+
+@st.cache_resource(ttl=ASSET_RETRY_TTL)
+def start_download(task: str):
+    targets = {
+        "fonts": partial(get_font_assets().font_css, FONTS_CSS_URL, FONT_URL_PREFIX),
+        "logo": partial(get_assets().warm, (LOGO_URL,)),
+    }
+    thread = threading.Thread(target=targets[task], name=f"assets-{task}", daemon=True)
+    thread.start()
+    return thread
+
 # =========================
 # Logo config (local + GitHub)
 # =========================
@@ -65,10 +112,14 @@ LOGO_URL = st.secrets.get("LOGO_URL", "").strip()
 LOGO_MAX_PX = 48
 
 _pdf_logo_path = None
+_pdf_logo_type = ""
 _html_logo_src = None
 
+# fpdf déduit le format de l'extension, absente des URLs du type « .../logo?raw=true »
+_PDF_IMAGE_TYPES = {".png": "png", ".jpg": "jpg", ".jpeg": "jpg", ".gif": "gif"}
+
 def _load_logo_sources():
-    global _pdf_logo_path, _html_logo_src
+    global _pdf_logo_path, _pdf_logo_type, _html_logo_src
 
     if LOGO_PATH.exists():
         try:
@@ -80,17 +131,20 @@ def _load_logo_sources():
             pass
 
     if LOGO_URL:
-        try:
-            resp = requests.get(LOGO_URL, timeout=10)
-            resp.raise_for_status()
+        # Servi depuis le cache local : HTML (data URI) et PDF (fichier) lisent les mêmes octets
+        cached = get_assets().cached(LOGO_URL)
+        if cached is None:
+            # Pendant le téléchargement en arrière-plan, le navigateur charge l'URL lui-même
+            start_download("logo")
             _html_logo_src = LOGO_URL
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-            tmp.write(resp.content)
-            tmp.flush()
-            _pdf_logo_path = tmp.name
-            return
-        except Exception:
-            pass
+        else:
+            try:
+                _html_logo_src = data_uri(cached, default_mime="image/png")
+                _pdf_logo_path = str(cached)
+                _pdf_logo_type = _PDF_IMAGE_TYPES.get(cached.suffix.lower(), "png")
+                return
+            except Exception:
+                pass
 
 _load_logo_sources()
 
@@ -110,9 +164,15 @@ THEME = {
 # =========================
 # CSS
 # =========================
+# Polices servies en statique une fois en cache ; @import distant tant que le cache est froid
+FONT_RULES = get_font_assets().cached_font_css(FONTS_CSS_URL)
+if FONT_RULES is None:
+    start_download("fonts")
+    FONT_RULES = f"@import url('{FONTS_CSS_URL}');"
+
 st.markdown(f"""
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Abril+Fatface&family=Montserrat:wght@300;400;500;600&family=Nunito:wght@400;600;700&display=swap');
+{FONT_RULES}
 
 :root {{
   --logo-max-height: {LOGO_MAX_PX}px;
@@ -312,97 +372,47 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-CSV_PATH = "palette_ncs_avec_adjectifs.csv"
+DATA_DIR = Path(__file__).parent
 
-# =========================
-# Utils NCS -> RGB (approx)
-# =========================
-BASE = {
-    "R": (1.0, 0.0, 0.0),
-    "Y": (1.0, 1.0, 0.0),
-    "G": (0.0, 1.0, 0.0),
-    "B": (0.0, 0.0, 1.0),
-    "W": (1.0, 1.0, 1.0),
-    "S": (0.0, 0.0, 0.0),
+# Nuanciers disponibles : nom affiché -> (fichier, type de loader, cf. catalogs.LOADERS)
+CATALOGS = {
+    "NCS": ("palette_ncs_avec_adjectifs.csv", "ncs"),
+    "Couleurs HEX": ("Colors.csv", "hex"),
 }
 
-def _mix(c1, c2, t):
-    return tuple((1 - t) * a + t * b for a, b in zip(c1, c2))
-
-def hue_to_rgb(hue: str):
-    if not hue or hue.upper() == "N":
-        return BASE["W"]
-
-    hue = hue.strip().upper()
-    if hue in BASE:
-        return BASE[hue]
-
-    m = re.match(r"^([RGBY])(\d{1,2})([RGBY])$", hue)
-    if m:
-        a, pct, b = m.group(1), int(m.group(2)), m.group(3)
-        t = pct / 100.0
-        return _mix(BASE[a], BASE[b], t)
-
-    letters = [ch for ch in hue if ch in BASE]
-    if not letters:
-        return BASE["W"]
-
-    r = sum(BASE[ch][0] for ch in letters) / len(letters)
-    g = sum(BASE[ch][1] for ch in letters) / len(letters)
-    b = sum(BASE[ch][2] for ch in letters) / len(letters)
-    return (r, g, b)
-
-def ncs_to_rgb(ncs_code: str):
-    cleaned = (ncs_code or "").replace(" ", "")
-    m = re.match(r"^S(\d{2})(\d{2})-([A-Z](?:\d{1,2}[A-Z])?|N)$", cleaned)
-    if not m:
-        return (200, 200, 200)
-
-    blackness = int(m.group(1))
-    chroma = int(m.group(2))
-    hue = m.group(3)
-    whiteness = max(0, 100 - blackness - chroma)
-
-    hr, hg, hb = hue_to_rgb(hue)
-
-    r = (chroma / 100.0) * hr + (whiteness / 100.0) * BASE["W"][0] + (blackness / 100.0) * BASE["S"][0]
-    g = (chroma / 100.0) * hg + (whiteness / 100.0) * BASE["W"][1] + (blackness / 100.0) * BASE["S"][1]
-    b = (chroma / 100.0) * hb + (whiteness / 100.0) * BASE["W"][2] + (blackness / 100.0) * BASE["S"][2]
-
-    return (int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
-
-def rgb_to_hex(rgb):
-    return "#{:02X}{:02X}{:02X}".format(*rgb)
-
-def _rgb_to_hsv_tuple(rgb):
-    r, g, b = [c / 255.0 for c in rgb]
-    h, s, v = colorsys.rgb_to_hsv(r, g, b)
-    return (h, s, v)
+# Nuanciers distants déclarés dans les Secrets : [REMOTE_CATALOGS.<nom>] url = "...", kind = "ncs"
+for _name, _spec in st.secrets.get("REMOTE_CATALOGS", {}).items():
+    CATALOGS[_name] = (_spec["url"], _spec.get("kind", "ncs"))
 
 # =========================
 # Chargement des données
 # =========================
-@st.cache_data
-def load_data(path: str):
-    df = pd.read_csv(path, sep=";")
-    required = {
-        "ncs_code", "nom", "noirceur%", "saturation%", "teinte",
-        "temperature", "clarte", "luminosite", "is_neutre"
-    }
-    missing = required - set(df.columns)
-    if missing:
-        st.error(f"Colonnes manquantes dans {path} : {', '.join(sorted(missing))}")
-        st.stop()
-    return df
-
-df = load_data(CSV_PATH)
-df["nom"] = df["nom"].fillna("").astype(str)
+@st.cache_resource
+def get_registry(conversion: str):
+    # Partagé entre sessions : chaque nuancier n'est chargé et indexé qu'une fois par mode
+    registry = CatalogRegistry(conversion)
+    for name, (src, kind) in CATALOGS.items():
+        if src.startswith(("http://", "https://")):
+            # Téléchargé au premier chargement, et retenté à chaque sélection tant qu'il manque
+            assets = get_assets()
+            registry.register(name, assets.cache_path(src), kind, fetch=partial(assets.fetch, src))
+        else:
+            registry.register(name, DATA_DIR / src, kind)
+    return registry
 
 # =========================
 # Filtres
 # =========================
 with st.sidebar:
     st.markdown("### Vos critères")
+    catalog_name = st.selectbox("Nuancier", list(CATALOGS), key="catalog")
+    SEARCH_QUERY = st.text_input(
+        "Recherche",
+        placeholder="ex. jaune chaud S05",
+        help="Mots du nom, teinte (Y50R), noirceur (S05, S10-30) ou adjectifs.",
+        key="search_query"
+    ).strip()
+
     ADJ_OPTIONS = ["Chaud", "Froid", "Clair", "Foncé", "Lumineux", "Mat", "Neutre"]
 
     adj1 = st.selectbox("Adjectif prioritaire #1", ADJ_OPTIONS, index=ADJ_OPTIONS.index("Chaud"))
@@ -411,230 +421,156 @@ with st.sidebar:
 
     with st.expander("Options avancées"):
         SEUIL_STRICT = st.slider("Exigence du matching", 0.0, 1.0, 0.60, 0.05, key="seuil_strict")
+        RANKING_MODE = st.radio(
+            "Classement",
+            ["Strict", "Pondéré"],
+            horizontal=True,
+            key="ranking_mode",
+            help="Strict : les trois adjectifs doivent atteindre l'exigence. "
+                 "Pondéré : la moyenne pondérée des trois notes doit l'atteindre."
+        )
+        if RANKING_MODE == "Pondéré":
+            WEIGHTS = (
+                st.slider("Poids adjectif #1", 0.0, 1.0, 1.0, 0.05, key="weight_1"),
+                st.slider("Poids adjectif #2", 0.0, 1.0, 0.6, 0.05, key="weight_2"),
+                st.slider("Poids adjectif #3", 0.0, 1.0, 0.3, 0.05, key="weight_3"),
+            )
+            TOP_K = st.slider("Nombre maximum de couleurs", 12, 360, 144, 12, key="top_k")
+        conversion = st.radio(
+            "Conversion NCS → écran",
+            list(CONVERSIONS),
+            format_func=CONVERSIONS.get,
+            key="conversion",
+            help=(
+                "Deux aperçus écran, aucun n'est colorimétriquement exact. Le lissage interpole "
+                "les teintes entre quelques rendus écran indicatifs : fiez-vous au nuancier physique."
+            )
+        )
 
 if "SEUIL_STRICT" not in locals():
     SEUIL_STRICT = 0.60
 
-# =========================
-# Préparation des données
-# =========================
-df_view = df.copy()
-df_view["rgb"] = df_view["ncs_code"].apply(ncs_to_rgb)
-df_view["hex"] = df_view["rgb"].apply(rgb_to_hex)
-
-def score_adjective(row: pd.Series, adj: str) -> float:
-    adj = (adj or "").strip().lower()
-    temp = (row.get("temperature") or "").strip().lower()
-    clar = (row.get("clarte") or "").strip().lower()
-    lumo = (row.get("luminosite") or "").strip().lower()
-    noir = float(row.get("noirceur%", 0))
-    sat = float(row.get("saturation%", 0))
-
-    if adj == "chaud":
-        return 1.0 if temp == "chaud" else (0.6 if temp == "neutre" else 0.0)
-
-    if adj == "froid":
-        return 1.0 if temp == "froid" else (0.6 if temp == "neutre" else 0.0)
-
-    if adj == "neutre":
-        base = 1.0 if temp == "neutre" else 0.0
-        bonus = max(0.0, (10.0 - sat) / 10.0)
-        return min(1.0, base + 0.6 * bonus)
-
-    if adj == "clair":
-        s = 1.0 - (noir / 100.0)
-        if clar == "clair":
-            s = min(1.0, s + 0.15)
-        return s
-
-    if adj == "foncé":
-        s = noir / 100.0
-        if clar == "foncé":
-            s = min(1.0, s + 0.15)
-        return s
-
-    if adj == "lumineux":
-        return 1.0 if lumo == "lumineux" else 0.3 + 0.7 * (sat / 100.0)
-
-    if adj == "mat":
-        return 1.0 if lumo == "mat" else 0.7 * (1.0 - sat / 100.0)
-
-    return 0.0
-
-def color_family_from_rgb(rgb_tuple):
-    r, g, b = [c / 255.0 for c in rgb_tuple]
-    h, s, v = colorsys.rgb_to_hsv(r, g, b)
-
-    if s < 0.05 or v < 0.1:
-        return "grey"
-
-    deg = h * 360.0
-    if 345 <= deg or deg < 15:
-        return "red"
-    if 15 <= deg < 45:
-        return "orange"
-    if 45 <= deg < 75:
-        return "yellow"
-    if 75 <= deg < 165:
-        return "green"
-    if 165 <= deg < 195:
-        return "cyan"
-    if 195 <= deg < 255:
-        return "blue"
-    if 255 <= deg < 300:
-        return "violet"
-    if 300 <= deg < 345:
-        return "magenta"
-    return "other"
-
-w1, w2, w3 = 1.0, 0.6, 0.3
-
-df_view["s1"] = df_view.apply(lambda r: score_adjective(r, adj1), axis=1)
-df_view["s2"] = df_view.apply(lambda r: score_adjective(r, adj2), axis=1)
-df_view["s3"] = df_view.apply(lambda r: score_adjective(r, adj3), axis=1)
-
-df_view["score_global"] = (
-    w1 * df_view["s1"] +
-    w2 * df_view["s2"] +
-    w3 * df_view["s3"]
-) + 0.05 * (df_view["saturation%"] / 100.0)
-
-df_view["famille"] = df_view["rgb"].apply(color_family_from_rgb)
-
-mask_strict = (
-    (df_view["s1"] >= SEUIL_STRICT) &
-    (df_view["s2"] >= SEUIL_STRICT) &
-    (df_view["s3"] >= SEUIL_STRICT)
-)
-
-result = df_view.loc[mask_strict].copy()
+if "RANKING_MODE" not in locals():
+    RANKING_MODE = "Strict"
 
 # =========================
-# Gestion si aucun résultat strict
+# État de session
 # =========================
-def best_family_alternatives(df_source, family_names, top_n=6):
-    if isinstance(family_names, str):
-        family_names = [family_names]
-
-    subset = df_source[df_source["famille"].isin(family_names)].copy()
-    if subset.empty:
-        return subset
-
-    # On se base uniquement sur le 1er adjectif
-    subset["score_1adj"] = subset["s1"]
-
-    # Filtre strict sur le 1er adjectif
-    subset = subset[subset["s1"] >= SEUIL_STRICT].copy()
-
-    # Si c'est vide, on relâche un peu
-    if subset.empty:
-        relaxed_threshold = max(0.35, SEUIL_STRICT - 0.20)
-        subset = df_source[df_source["famille"].isin(family_names)].copy()
-        subset["score_1adj"] = subset["s1"]
-        subset = subset[subset["s1"] >= relaxed_threshold].copy()
+state_manager = SessionStateManager(st.session_state)
 
-    if subset.empty:
-        return subset
-
-    # Petit bonus léger pour mieux trier à l'intérieur,
-    # sans rendre les adjectifs 2 et 3 bloquants
-    temp = subset["temperature"].fillna("").astype(str).str.lower()
-    lumo = subset["luminosite"].fillna("").astype(str).str.lower()
-    clar = subset["clarte"].fillna("").astype(str).str.lower()
-    sat = subset["saturation%"].astype(float)
-    noir = subset["noirceur%"].astype(float)
-
-    subset["family_fit_bonus"] = 0.0
-
-    selected_first = adj1.lower()
-
-    if selected_first == "froid":
-        subset.loc[temp.eq("froid"), "family_fit_bonus"] += 0.15
-        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
-
-    elif selected_first == "chaud":
-        subset.loc[temp.eq("chaud"), "family_fit_bonus"] += 0.15
-        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
+def end_run():
+    """Fin de passage : purge des clés de widgets inutilisées et bilan de session."""
+    state_manager.collect_garbage()
+    with st.sidebar:
+        session_report = state_manager.memory_report()
+        st.caption(
+            f"Session : {session_report['clés']} clés "
+            f"({session_report['widgets gérés']} widgets), "
+            f"~{session_report['octets'] / 1024:.1f} Ko"
+        )
 
-    elif selected_first == "mat":
-        subset.loc[lumo.eq("mat"), "family_fit_bonus"] += 0.12
-        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+def stop_run():
+    # st.stop() interrompt le script : la purge doit passer avant
+    end_run()
+    st.stop()
 
-    elif selected_first == "lumineux":
-        subset.loc[lumo.eq("lumineux"), "family_fit_bonus"] += 0.12
-        subset["family_fit_bonus"] += (sat / 100.0) * 0.06
+# Seul l'identifiant compact des critères est conservé ; un changement ramène à la page 1
+if state_manager.remember("criteria", (catalog_name, adj1, adj2, adj3, SEARCH_QUERY)):
+    st.session_state.page = 1
 
-    elif selected_first == "foncé":
-        subset.loc[clar.eq("foncé"), "family_fit_bonus"] += 0.12
-        subset["family_fit_bonus"] += (noir / 100.0) * 0.08
+if "conversion" not in locals():
+    conversion = "approx"
 
-    elif selected_first == "clair":
-        subset.loc[clar.eq("clair"), "family_fit_bonus"] += 0.12
-        subset["family_fit_bonus"] += (1.0 - noir / 100.0) * 0.08
+registry = get_registry(conversion)
+catalog = registry.get(catalog_name)
+try:
+    df = catalog.frame
+except (OSError, ValueError) as exc:
+    st.error(f"Impossible de charger le nuancier « {catalog_name} » : {exc}")
+    stop_run()
 
-    elif selected_first == "neutre":
-        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.12
-        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+with st.sidebar:
+    for issue in catalog.issues:
+        st.warning(issue)
 
-    subset["alt_score"] = subset["score_1adj"] + subset["family_fit_bonus"]
+    with st.expander("Nuanciers en mémoire"):
+        st.dataframe(registry.memory_report(), hide_index=True, use_container_width=True)
 
-    subset = subset.sort_values(
-        by=["alt_score", "score_1adj", "score_global"],
-        ascending=[False, False, False]
+# =========================
+# Préparation des données
+# =========================
+df_view = df.copy()
+# Position dans le nuancier : relie les lignes du résultat, réordonnées, aux index par nuancier
+df_view["position"] = np.arange(len(df_view))
+
+# Notes par adjectif précalculées une fois par nuancier : seules les colonnes choisies sont lues
+adj_columns = [ADJECTIVES.index(a.lower()) for a in (adj1, adj2, adj3)]
+df_view[["s1", "s2", "s3"]] = catalog.scores[:, adj_columns]
+
+# Familles, HSV et ordre d'affichage : calculés une fois par nuancier
+family_order = catalog.family_order
+df_view["famille"] = family_order.famille
+df_view[["H", "S", "V"]] = family_order.hsv
+
+if RANKING_MODE == "Pondéré":
+    # Re-classement = un produit matrice-vecteur + sélection top-k
+    ranked, weighted_score = rank_weighted(
+        catalog.scores,
+        weight_vector((adj1, adj2, adj3), WEIGHTS),
+        saturation_bonus(df_view),
+        SEUIL_STRICT,
+        TOP_K
+    )
+    df_view["score_global"] = weighted_score
+    result = df_view.iloc[ranked].copy()
+else:
+    selected, strict_score = select_strict(
+        catalog.scores, adj_columns, saturation_bonus(df_view), SEUIL_STRICT
     )
+    df_view["score_global"] = strict_score
+    result = df_view.iloc[selected].copy()
 
-    subset = subset.drop_duplicates(subset=["ncs_code"])
-    return subset.head(top_n)
+if SEARCH_QUERY:
+    # La recherche porte sur tout le nuancier, classée par pertinence puis par note
+    positions, relevance = catalog.search_index.query(SEARCH_QUERY)
+    result = df_view.iloc[rank_results(positions, relevance, df_view["score_global"])].copy()
+    if result.empty:
+        st.info(f"Aucune couleur ne correspond à la recherche « {SEARCH_QUERY} ».")
+        stop_run()
 
 # =========================
 # Ordre d'affichage principal
 # =========================
-result[["H", "S", "V"]] = result["rgb"].apply(_rgb_to_hsv_tuple).apply(pd.Series)
-
-PAGE_GROUPS = [
-    ("Tons rosés", {"red", "magenta", "violet"}),
-    ("Tons orangés/jaunes", {"orange", "yellow"}),
-    ("Tons verts", {"green", "cyan"}),
-    ("Tons bleus", {"blue"}),
-    ("Tons neutres", {"grey", "other"}),
-]
-
-ordered_chunks = []
-
-for _, fam_set in PAGE_GROUPS:
-    df_group = result[result["famille"].isin(fam_set)].copy()
-    if df_group.empty:
-        continue
-
-    if fam_set == {"grey", "other"}:
-        df_group = df_group.sort_values(by=["V", "S"], ascending=[True, False]).reset_index(drop=True)
-    else:
-        df_group = df_group.sort_values(by=["H", "V", "S"], ascending=[True, True, False]).reset_index(drop=True)
-
-    ordered_chunks.append(df_group)
-
-if ordered_chunks:
-    result = pd.concat(ordered_chunks, ignore_index=True)
+if SEARCH_QUERY:
+    # Résultats de recherche : l'ordre de pertinence est conservé dans la grille,
+    # le PDF reste classé par groupes de pages
+    result_by_family = family_order.ordered(result)
+    result = result.reset_index(drop=True)
 else:
+    result = family_order.ordered(result)
+    result_by_family = result
+
+if result.empty:
     st.info("Aucune couleur exploitable n’a pu être affichée.")
-    st.stop()
+    stop_run()
 
 # =========================
 # Familles absentes -> alternatives
 # =========================
 present_families = set(result["famille"].unique()) if not result.empty else set()
 
-missing_red_family = "red" not in present_families
-missing_yellow_family = "yellow" not in present_families
+# Pas de rouges/jaunes conseillés pendant une recherche : le résultat ne dépend pas des adjectifs
+missing_red_family = not SEARCH_QUERY and "red" not in present_families
+missing_yellow_family = not SEARCH_QUERY and "yellow" not in present_families
 
 suggested_reds = pd.DataFrame()
 suggested_yellows = pd.DataFrame()
 
 if missing_red_family:
-    suggested_reds = best_family_alternatives(df_view, ["red"], top_n=6)
+    suggested_reds = best_family_alternatives(df_view, ["red"], adj1, SEUIL_STRICT, top_n=6)
 
 if missing_yellow_family:
-    suggested_yellows = best_family_alternatives(df_view, ["yellow"], top_n=6)
+    suggested_yellows = best_family_alternatives(df_view, ["yellow"], adj1, SEUIL_STRICT, top_n=6)
 
 # =========================
 # Affichage cartes
@@ -650,7 +586,7 @@ def _latin1_safe(s: str) -> str:
         s = s.replace(a, b)
     return s.encode("latin-1", errors="replace").decode("latin-1")
 
-def swatch_card(row, key_prefix="main"):
+def swatch_card(row, key_prefix="main", caption=None):
     r, g, b = row["rgb"]
     hexcode = row["hex"]
 
@@ -663,15 +599,19 @@ def swatch_card(row, key_prefix="main"):
         unsafe_allow_html=True
     )
 
-    unique_key = f"{key_prefix}_hex_{row.name}_{row['ncs_code']}_{hexcode}"
+    # Clé liée à l'emplacement (et non à la couleur) : le nombre de clés reste
+    # borné par la page affichée ; la valeur est réinjectée à chaque passage.
+    slot_key = state_manager.widget_key(key_prefix, "hex")
+    st.session_state[slot_key] = hexcode
     st.text_input(
         "HEX",
-        value=hexcode,
         label_visibility="collapsed",
-        key=unique_key
+        key=slot_key
     )
+    if caption:
+        st.caption(caption)
 
-def render_grid(dataframe, cols_per_row=6, key_prefix="main"):
+def render_grid(dataframe, cols_per_row=6, key_prefix="main", captions=None):
     rows = math.ceil(len(dataframe) / cols_per_row)
     for r in range(rows):
         cols = st.columns(cols_per_row)
@@ -679,7 +619,11 @@ def render_grid(dataframe, cols_per_row=6, key_prefix="main"):
             idx = r * cols_per_row + j
             if idx < len(dataframe):
                 with cols[j]:
-                    swatch_card(dataframe.iloc[idx], key_prefix=f"{key_prefix}_{idx}")
+                    swatch_card(
+                        dataframe.iloc[idx],
+                        key_prefix=f"{key_prefix}_{idx}",
+                        caption=captions[idx] if captions else None
+                    )
 
 def render_alternative_block(title, df_alt, key_prefix):
     if df_alt.empty:
@@ -723,6 +667,53 @@ chunk = result.iloc[start:end].copy()
 
 render_grid(chunk, cols_per_row=6, key_prefix="main_page")
 
+# =========================
+# Harmonies
+# =========================
+# Index par teinte calculé une fois par nuancier ; compagnons pris dans le résultat
+# noté, et dans tout le nuancier pour les seules fenêtres de teinte vides du résultat
+hue_index = catalog.hue_index
+score_global = df_view["score_global"].to_numpy()
+in_result = np.zeros(len(df_view), dtype=bool)
+in_result[result["position"].to_numpy()] = True
+
+st.markdown("<h3 class='alt-section-title'>Harmonies</h3>", unsafe_allow_html=True)
+col_base, col_kind = st.columns([2, 1])
+
+with col_base:
+    base_code = st.selectbox("Couleur de départ", chunk["ncs_code"].tolist(), key="harmony_base")
+with col_kind:
+    harmony_name = st.selectbox("Harmonie", list(HARMONIES), key="harmony_kind")
+
+# Suggestions calculées en lot pour toute la page
+offsets = np.asarray(HARMONIES[harmony_name])
+chunk_positions = chunk["position"].to_numpy()
+page_suggestions = hue_index.suggest(
+    df_view["H"].to_numpy()[chunk_positions] * 360.0, offsets, score_global, in_result
+)
+base_row = chunk["ncs_code"].tolist().index(base_code)
+base_pos = int(chunk_positions[base_row])
+
+if df_view["famille"].iloc[base_pos] == "grey":
+    st.info("Couleur neutre : pas d'harmonie de teinte à proposer.")
+else:
+    suggestions = page_suggestions[base_row]
+    empty = suggestions < 0
+    if empty.any():
+        suggestions[empty] = hue_index.suggest(
+            [df_view["H"].iloc[base_pos] * 360.0], offsets[empty], score_global
+        )[0]
+    companions = [int(p) for p in suggestions if p >= 0 and p != base_pos]
+    if companions:
+        render_grid(
+            df_view.iloc[[base_pos] + companions],
+            cols_per_row=6,
+            key_prefix="harmony",
+            captions=[None] + [None if in_result[p] else "Hors résultat (nuancier)" for p in companions]
+        )
+    else:
+        st.info("Aucune couleur du nuancier ne forme cette harmonie.")
+
 # =========================
 # Alternatives familles absentes
 # =========================
@@ -740,6 +731,24 @@ if missing_yellow_family and not suggested_yellows.empty:
     )
     render_alternative_block("Jaunes conseillés", suggested_yellows, key_prefix="alt_yellow")
 
+# =========================
+# Correspondances entre nuanciers
+# =========================
+other_catalogs = [name for name in registry.names() if name != catalog_name]
+
+if other_catalogs:
+    with st.expander("Correspondances dans un autre nuancier"):
+        target_name = st.selectbox("Nuancier cible", other_catalogs, key="cross_catalog")
+        # Le corps d'un expander s'exécute même replié : le nuancier cible n'est
+        # chargé et comparé qu'à la demande
+        if st.toggle("Afficher les correspondances", key="cross_catalog_on"):
+            try:
+                matches = cross_catalog_matches(result, registry.get(target_name))
+            except (OSError, ValueError) as exc:
+                st.error(f"Impossible de charger le nuancier « {target_name} » : {exc}")
+            else:
+                st.dataframe(matches, hide_index=True, use_container_width=True)
+
 # =========================
 # Table détaillée
 # =========================
@@ -778,9 +787,10 @@ with st.expander("Voir la table détaillée"):
 CREDIT_FOOTER = "Nuancier généré par Otto Amélie – Tous droits réservés"
 
 class PDF(FPDF):
-    def __init__(self, logo_path=None, credit=""):
+    def __init__(self, logo_path=None, credit="", logo_type=""):
         super().__init__(orientation="P", unit="mm", format="A4")
         self.logo_path = logo_path
+        self.logo_type = logo_type
         self.credit = credit
         self.current_title = ""
 
@@ -796,7 +806,7 @@ class PDF(FPDF):
     def footer(self):
         if self.logo_path:
             try:
-                self.image(self.logo_path, x=20, y=270, w=60)
+                self.image(self.logo_path, x=20, y=270, w=60, type=self.logo_type)
             except Exception:
                 pass
 
@@ -806,83 +816,34 @@ class PDF(FPDF):
         self.cell(0, 8, _latin1_safe(self.credit), align="R")
 
 def generate_pdf_grouped_by_family_with_footer(dataframe: pd.DataFrame) -> bytes:
-    df_pdf = dataframe.copy()
+    """PDF d'un résultat déjà ordonné par FamilyOrder (colonne « groupe »)."""
+    df_pdf = dataframe
 
     if "rgb" not in df_pdf.columns:
-        df_pdf["rgb"] = df_pdf["ncs_code"].apply(ncs_to_rgb)
-
-    if "famille" not in df_pdf.columns:
-        df_pdf["famille"] = df_pdf["rgb"].apply(color_family_from_rgb)
-
-    df_pdf[["H", "S", "V"]] = df_pdf["rgb"].apply(_rgb_to_hsv_tuple).apply(pd.Series)
+        df_pdf = df_pdf.assign(rgb=df_pdf["ncs_code"].apply(ncs_to_rgb))
 
-    page_groups = [
-        ("Tons rosés", {"red", "magenta", "violet"}),
-        ("Tons orangés/jaunes", {"orange", "yellow"}),
-        ("Tons verts", {"green", "cyan"}),
-        ("Tons bleus", {"blue"}),
-        ("Tons neutres", {"grey", "other"}),
-    ]
-
-    pdf = PDF(logo_path=_pdf_logo_path, credit=CREDIT_FOOTER)
-    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf = PDF(logo_path=_pdf_logo_path, credit=CREDIT_FOOTER, logo_type=_pdf_logo_type)
+    pdf.set_auto_page_break(auto=True, margin=PDF_MARGIN)
     pdf.set_font("Helvetica", size=9)
 
-    left_margin, right_margin = 15, 15
-    usable_width = 210 - left_margin - right_margin
-    cols = 3
-    swatch_h = 25
-    gap_y = 10
-    swatch_w = usable_width / cols
-    start_y = 25
-    bottom_limit = 297 - 15
-
-    def add_group_pages(page_title: str, df_page: pd.DataFrame):
-        pdf.current_title = page_title
+    rgb = df_pdf["rgb"].to_numpy()
+    for page in pdf_page_layout(df_pdf):
+        pdf.current_title = page.title
         pdf.add_page()
 
-        col = 0
-        x0 = left_margin
-        y = start_y
-
-        for _, row in df_page.iterrows():
-            needed = swatch_h + 3 + 10
-            if y + needed > bottom_limit:
-                pdf.current_title = f"{page_title} (suite)"
-                pdf.add_page()
-                col = 0
-                y = start_y
-
-            x = x0 + col * swatch_w
-            r, g, b = row["rgb"]
+        for row, x, y in page.swatches:
+            r, g, b = rgb[row]
 
             pdf.set_fill_color(int(r), int(g), int(b))
-            pdf.rect(x, y, swatch_w, swatch_h, style="F")
+            pdf.rect(x, y, PDF_SWATCH_W, PDF_SWATCH_H, style="F")
 
-            pdf.set_xy(x, y + swatch_h + 3)
+            pdf.set_xy(x, y + PDF_SWATCH_H + PDF_LABEL_GAP)
             pdf.set_text_color(0, 0, 0)
-            pdf.multi_cell(w=swatch_w, h=5, txt="", border=0, align="L")
-
-            col += 1
-            if col >= cols:
-                col = 0
-                y = pdf.get_y() + gap_y
-
-    for page_title, fam_set in page_groups:
-        df_group = df_pdf[df_pdf["famille"].isin(fam_set)].copy()
-        if df_group.empty:
-            continue
-
-        if fam_set == {"grey", "other"}:
-            df_group = df_group.sort_values(by=["V", "S"], ascending=[True, False]).reset_index(drop=True)
-        else:
-            df_group = df_group.sort_values(by=["H", "V", "S"], ascending=[True, True, False]).reset_index(drop=True)
-
-        add_group_pages(page_title, df_group)
+            pdf.multi_cell(w=PDF_SWATCH_W, h=PDF_LABEL_H, txt="", border=0, align="L")
 
     return pdf.output(dest="S").encode("latin-1", "replace")
 
-pdf_bytes = generate_pdf_grouped_by_family_with_footer(result)
+pdf_bytes = generate_pdf_grouped_by_family_with_footer(result_by_family)
 
 st.download_button(
     "Télécharger le PDF",
@@ -892,3 +853,5 @@ st.download_button(
 )
 
 st.caption("Produit développé par Otto Amélie")
+
+end_run()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Conversions vectorisées sRGB <-> CIELAB (illuminant D65)."""
+import numpy as np
+
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_SRGB = np.linalg.inv(_SRGB_TO_XYZ)
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+_EPS = 216 / 24389
+_KAPPA = 24389 / 27
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB 0-255 (n, 3) -> CIELAB D65 (n, 3)."""
+    c = np.asarray(rgb, dtype=np.float64).reshape(-1, 3) / 255.0
+    lin = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = lin @ _SRGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > _EPS, np.cbrt(xyz), (_KAPPA * xyz + 16) / 116)
+    return np.stack([
+        116 * f[:, 1] - 16,
+        500 * (f[:, 0] - f[:, 1]),
+        200 * (f[:, 1] - f[:, 2]),
+    ], axis=1)
+
+def lab_to_rgb(lab: np.ndarray) -> np.ndarray:
+    """CIELAB D65 (n, 3) -> sRGB 0-255 en flottants, ramené dans le gamut par écrêtage."""
+    lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+    fy = (lab[:, 0] + 16) / 116
+    f = np.stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200], axis=1)
+    xyz = np.where(f ** 3 > _EPS, f ** 3, (116 * f - 16) / _KAPPA) * _WHITE_D65
+    lin = np.clip(xyz @ _XYZ_TO_SRGB.T, 0.0, 1.0)
+    c = np.where(lin <= 0.0031308, 12.92 * lin, 1.055 * lin ** (1 / 2.4) - 0.055)
+    return c * 255.0
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Familles de couleurs, ordre d'affichage par groupes de pages et mise en page du PDF."""
+import colorsys
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ncs import parse_ncs, _rgb_to_hsv_tuple
+
+# Groupes de pages, dans l'ordre d'affichage (grille, table détaillée, PDF)
+PAGE_GROUPS = [
+    ("Tons rosés", {"red", "magenta", "violet"}),
+    ("Tons orangés/jaunes", {"orange", "yellow"}),
+    ("Tons verts", {"green", "cyan"}),
+    ("Tons bleus", {"blue"}),
+    ("Tons neutres", {"grey", "other"}),
+]
+NEUTRAL_FAMILIES = {"grey", "other"}
+
+def color_family_from_rgb(rgb_tuple):
+    r, g, b = [c / 255.0 for c in rgb_tuple]
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+
+    if s < 0.05 or v < 0.1:
+        return "grey"
+
+    deg = h * 360.0
+    if 345 <= deg or deg < 15:
+        return "red"
+    if 15 <= deg < 45:
+        return "orange"
+    if 45 <= deg < 75:
+        return "yellow"
+    if 75 <= deg < 165:
+        return "green"
+    if 165 <= deg < 195:
+        return "cyan"
+    if 195 <= deg < 255:
+        return "blue"
+    if 255 <= deg < 300:
+        return "violet"
+    if 300 <= deg < 345:
+        return "magenta"
+    return "other"
+
+def color_family(ncs_code, rgb_tuple):
+    # Un code NCS neutre (« -N ») est gris par définition, sans passer par le HSV
+    code = parse_ncs(ncs_code)
+    if code is not None and code.is_neutral:
+        return "grey"
+    return color_family_from_rgb(rgb_tuple)
+
+
+class FamilyOrder:
+    """Permutation globale d'un nuancier dans l'ordre d'affichage, calculée une fois.
+
+    Ordre : groupe de PAGE_GROUPS, puis H, V croissants et S décroissante
+    (V croissante et S décroissante pour les neutres). Tout sous-ensemble du
+    nuancier s'ordonne en O(n) par un masque sur cette permutation, sans tri,
+    quel que soit l'ordre des positions reçues (classement pondéré, recherche) ;
+    à clés égales, l'ordre du nuancier est conservé.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.famille = np.array(
+            [color_family(c, rgb) for c, rgb in zip(frame["ncs_code"], frame["rgb"])],
+            dtype=object
+        )
+        self.hsv = np.array([_rgb_to_hsv_tuple(rgb) for rgb in frame["rgb"]], dtype=np.float64).reshape(-1, 3)
+
+        self.group = np.full(len(frame), -1, dtype=np.int8)
+        for gi, (_, fam_set) in enumerate(PAGE_GROUPS):
+            self.group[np.isin(self.famille, list(fam_set))] = gi
+
+        h, s, v = self.hsv[:, 0], self.hsv[:, 1], self.hsv[:, 2]
+        neutral = np.isin(self.famille, list(NEUTRAL_FAMILIES))
+        perm = np.lexsort((-s, v, np.where(neutral, 0.0, h), self.group))
+        self.perm = perm[self.group[perm] >= 0]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.famille.nbytes + self.hsv.nbytes + self.group.nbytes + self.perm.nbytes)
+
+    def order(self, positions) -> np.ndarray:
+        """Positions du nuancier, dans n'importe quel ordre -> mêmes positions dans l'ordre d'affichage."""
+        mask = np.zeros(len(self.group), dtype=bool)
+        mask[np.asarray(positions, dtype=np.int64)] = True
+        return self.perm[mask[self.perm]]
+
+    def titles(self, positions) -> np.ndarray:
+        """Titre du groupe de pages de chaque position."""
+        names = np.array([title for title, _ in PAGE_GROUPS], dtype=object)
+        return names[self.group[np.asarray(positions, dtype=np.int64)]]
+
+    def ordered(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Lignes de `frame` (index = positions dans le nuancier) dans l'ordre d'affichage, avec « groupe »."""
+        positions = self.order(frame.index.to_numpy())
+        ordered = frame.loc[positions].reset_index(drop=True)
+        ordered["groupe"] = self.titles(positions)
+        return ordered
+
+
+# =========================
+# Mise en page du PDF (mm, A4 portrait)
+# =========================
+PDF_PAGE_W, PDF_PAGE_H = 210, 297
+PDF_MARGIN = 15
+PDF_COLS = 3
+PDF_SWATCH_W = (PDF_PAGE_W - 2 * PDF_MARGIN) / PDF_COLS
+PDF_SWATCH_H = 25
+PDF_LABEL_GAP = 3      # entre l'aplat et sa légende
+PDF_LABEL_H = 5        # hauteur de ligne de la légende
+PDF_LABEL_ROOM = 10    # place exigée sous l'aplat avant de changer de page
+PDF_GAP_Y = 10
+PDF_START_Y = 25
+PDF_BOTTOM = PDF_PAGE_H - PDF_MARGIN
+
+
+class PdfPage(NamedTuple):
+    title: str
+    swatches: list     # (ligne du résultat, x, y) de chaque aplat
+
+
+def pdf_page_layout(frame: pd.DataFrame) -> list:
+    """Pages du PDF d'un résultat ordonné par FamilyOrder (colonne « groupe »).
+
+    Chaque groupe commence une page ; une page pleine continue sur une page
+    « (suite) ». Les lignes sont des positions dans `frame`.
+    """
+    pages = []
+    groups = frame["groupe"].to_numpy()
+    needed = PDF_SWATCH_H + PDF_LABEL_GAP + PDF_LABEL_ROOM
+    row_h = PDF_SWATCH_H + PDF_LABEL_GAP + PDF_LABEL_H + PDF_GAP_Y
+    for title in dict.fromkeys(groups):
+        page = PdfPage(title, [])
+        pages.append(page)
+        col, y = 0, PDF_START_Y
+        for row in np.flatnonzero(groups == title):
+            if y + needed > PDF_BOTTOM:
+                page = PdfPage(f"{title} (suite)", [])
+                pages.append(page)
+                col, y = 0, PDF_START_Y
+
+            page.swatches.append((int(row), PDF_MARGIN + col * PDF_SWATCH_W, y))
+            col += 1
+            if col >= PDF_COLS:
+                col = 0
+                y += row_h
+    return pages
@@ -0,0 +1,630 @@
+# -*- coding: utf-8 -*-
+"""Tests différentiels : implémentations de référence contre moteurs optimisés.
+
+Chaque vérification exécute côte à côte la référence (calcul ligne à ligne,
+tel que l'app le faisait avant optimisation) et le moteur utilisé par l'app,
+sur les nuanciers livrés, un nuancier synthétique et des codes NCS, triplets
+d'adjectifs, seuils et poids tirés au sort. Les résultats doivent être
+identiques : mêmes couleurs, même ordre, mêmes notes, mêmes pages PDF, aux
+seuls écarts voulus près (INTENDED_CHANGES), qui sont comptés et affichés.
+Les deux côtés sont chronométrés.
+
+Usage : python golden.py [nom ...]   (sans argument : toutes les vérifications)
+Le code de sortie est non nul si une vérification relève un écart.
+"""
+import colorsys
+import random
+import re
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+import ncs
+from bench import random_ncs_codes, synthetic_catalog
+from catalogs import Catalog
+from families import PAGE_GROUPS, pdf_page_layout
+from scoring import (
+    ADJECTIVES, SCORE_DECIMALS, adjective_score_matrix, best_family_alternatives, rank_weighted,
+    saturation_bonus, select_strict, weight_vector
+)
+
+DATA_DIR = Path(__file__).parent
+SHIPPED = [
+    ("Nuancier NCS", DATA_DIR / "palette_ncs_avec_adjectifs.csv", "ncs"),
+    ("Nuancier HEX", DATA_DIR / "Colors.csv", "hex"),
+]
+SYNTHETIC_SIZE = 5_000
+CASES = 40              # triplets d'adjectifs tirés au sort par nuancier
+SEED = 0
+
+CHECKS = {}
+
+def golden(func):
+    CHECKS[func.__name__.removeprefix("check_")] = func
+    return func
+
+class Stopwatch:
+    """Temps cumulés de la référence et du moteur sur une vérification."""
+
+    def __init__(self):
+        self.totals = {"référence": 0.0, "moteur": 0.0}
+
+    def run(self, side, func, *args, **kwargs):
+        t0 = time.perf_counter()
+        out = func(*args, **kwargs)
+        self.totals[side] += time.perf_counter() - t0
+        return out
+
+    def report(self):
+        ref, eng = self.totals["référence"], self.totals["moteur"]
+        ratio = f"x{ref / eng:,.1f}" if eng > 0 else "-"
+        print(f"  {'référence':<12} {ref * 1000:10.1f} ms")
+        print(f"  {'moteur':<12} {eng * 1000:10.1f} ms   {ratio}")
+
+def assert_same(what, reference, engine, tolerance=0.0):
+    """Égalité stricte ; `tolerance` > 0 n'admet que des écarts d'arrondi sur les colonnes numériques."""
+    if isinstance(reference, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(
+                reference.reset_index(drop=True), engine.reset_index(drop=True),
+                check_dtype=False, check_exact=not tolerance, rtol=tolerance, atol=tolerance
+            )
+        except AssertionError as exc:
+            raise AssertionError(f"{what} : {exc}") from None
+        return
+    if isinstance(reference, np.ndarray):
+        if reference.shape != engine.shape or not np.array_equal(reference, engine):
+            diff = np.flatnonzero(np.asarray(reference != engine).reshape(len(reference), -1).any(axis=1))
+            raise AssertionError(f"{what} : {len(diff)} ligne(s) différente(s), dont la ligne {diff[:1]}")
+        return
+    if reference != engine:
+        for i, (a, b) in enumerate(zip(reference, engine)):
+            if a != b:
+                raise AssertionError(f"{what} : élément {i} : {a!r} (référence) != {b!r} (moteur)")
+        raise AssertionError(f"{what} : {len(reference)} élément(s) (référence) != {len(engine)} (moteur)")
+
+# =========================
+# Références figées
+# =========================
+# Copies conformes du code de l'app avant optimisation : elles ne doivent pas
+# évoluer avec les moteurs.
+_REFERENCE_NCS_RE = r"^S(\d{2})(\d{2})-([A-Z](?:\d{1,2}[A-Z])?|N)$"
+
+def reference_hue_to_rgb(hue: str):
+    BASE = ncs.BASE
+    if not hue or hue.upper() == "N":
+        return BASE["W"]
+
+    hue = hue.strip().upper()
+    if hue in BASE:
+        return BASE[hue]
+
+    m = re.match(r"^([RGBY])(\d{1,2})([RGBY])$", hue)
+    if m:
+        a, pct, b = m.group(1), int(m.group(2)), m.group(3)
+        t = pct / 100.0
+        return tuple((1 - t) * x + t * y for x, y in zip(BASE[a], BASE[b]))
+
+    letters = [ch for ch in hue if ch in BASE]
+    if not letters:
+        return BASE["W"]
+
+    r = sum(BASE[ch][0] for ch in letters) / len(letters)
+    g = sum(BASE[ch][1] for ch in letters) / len(letters)
+    b = sum(BASE[ch][2] for ch in letters) / len(letters)
+    return (r, g, b)
+
+def reference_ncs_to_rgb(ncs_code: str):
+    BASE = ncs.BASE
+    cleaned = (ncs_code or "").replace(" ", "")
+    m = re.match(_REFERENCE_NCS_RE, cleaned)
+    if not m:
+        return (200, 200, 200)
+
+    blackness = int(m.group(1))
+    chroma = int(m.group(2))
+    hue = m.group(3)
+    whiteness = max(0, 100 - blackness - chroma)
+
+    hr, hg, hb = reference_hue_to_rgb(hue)
+
+    r = (chroma / 100.0) * hr + (whiteness / 100.0) * BASE["W"][0] + (blackness / 100.0) * BASE["S"][0]
+    g = (chroma / 100.0) * hg + (whiteness / 100.0) * BASE["W"][1] + (blackness / 100.0) * BASE["S"][1]
+    b = (chroma / 100.0) * hb + (whiteness / 100.0) * BASE["W"][2] + (blackness / 100.0) * BASE["S"][2]
+
+    return (int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
+
+def reference_color_family_from_rgb(rgb_tuple):
+    r, g, b = [c / 255.0 for c in rgb_tuple]
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+
+    if s < 0.05 or v < 0.1:
+        return "grey"
+
+    deg = h * 360.0
+    if 345 <= deg or deg < 15:
+        return "red"
+    if 15 <= deg < 45:
+        return "orange"
+    if 45 <= deg < 75:
+        return "yellow"
+    if 75 <= deg < 165:
+        return "green"
+    if 165 <= deg < 195:
+        return "cyan"
+    if 195 <= deg < 255:
+        return "blue"
+    if 255 <= deg < 300:
+        return "violet"
+    if 300 <= deg < 345:
+        return "magenta"
+    return "other"
+
+def reference_score_adjective(row: pd.Series, adj: str) -> float:
+    adj = (adj or "").strip().lower()
+    temp = (row.get("temperature") or "").strip().lower()
+    clar = (row.get("clarte") or "").strip().lower()
+    lumo = (row.get("luminosite") or "").strip().lower()
+    noir = float(row.get("noirceur%", 0))
+    sat = float(row.get("saturation%", 0))
+
+    if adj == "chaud":
+        return 1.0 if temp == "chaud" else (0.6 if temp == "neutre" else 0.0)
+
+    if adj == "froid":
+        return 1.0 if temp == "froid" else (0.6 if temp == "neutre" else 0.0)
+
+    if adj == "neutre":
+        base = 1.0 if temp == "neutre" else 0.0
+        bonus = max(0.0, (10.0 - sat) / 10.0)
+        return min(1.0, base + 0.6 * bonus)
+
+    if adj == "clair":
+        s = 1.0 - (noir / 100.0)
+        if clar == "clair":
+            s = min(1.0, s + 0.15)
+        return s
+
+    if adj == "foncé":
+        s = noir / 100.0
+        if clar == "foncé":
+            s = min(1.0, s + 0.15)
+        return s
+
+    if adj == "lumineux":
+        return 1.0 if lumo == "lumineux" else 0.3 + 0.7 * (sat / 100.0)
+
+    if adj == "mat":
+        return 1.0 if lumo == "mat" else 0.7 * (1.0 - sat / 100.0)
+
+    return 0.0
+
+# Le seuil et le 1er adjectif étaient des globales du script : passés en paramètres
+def reference_best_family_alternatives(df_source, family_names, adj1, SEUIL_STRICT, top_n=6):
+    if isinstance(family_names, str):
+        family_names = [family_names]
+
+    subset = df_source[df_source["famille"].isin(family_names)].copy()
+    if subset.empty:
+        return subset
+
+    # On se base uniquement sur le 1er adjectif
+    subset["score_1adj"] = subset["s1"]
+
+    # Filtre strict sur le 1er adjectif
+    subset = subset[subset["s1"] >= SEUIL_STRICT].copy()
+
+    # Si c'est vide, on relâche un peu
+    if subset.empty:
+        relaxed_threshold = max(0.35, SEUIL_STRICT - 0.20)
+        subset = df_source[df_source["famille"].isin(family_names)].copy()
+        subset["score_1adj"] = subset["s1"]
+        subset = subset[subset["s1"] >= relaxed_threshold].copy()
+
+    if subset.empty:
+        return subset
+
+    # Petit bonus léger pour mieux trier à l'intérieur,
+    # sans rendre les adjectifs 2 et 3 bloquants
+    temp = subset["temperature"].fillna("").astype(str).str.lower()
+    lumo = subset["luminosite"].fillna("").astype(str).str.lower()
+    clar = subset["clarte"].fillna("").astype(str).str.lower()
+    sat = subset["saturation%"].astype(float)
+    noir = subset["noirceur%"].astype(float)
+
+    subset["family_fit_bonus"] = 0.0
+
+    selected_first = adj1.lower()
+
+    if selected_first == "froid":
+        subset.loc[temp.eq("froid"), "family_fit_bonus"] += 0.15
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
+
+    elif selected_first == "chaud":
+        subset.loc[temp.eq("chaud"), "family_fit_bonus"] += 0.15
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
+
+    elif selected_first == "mat":
+        subset.loc[lumo.eq("mat"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+
+    elif selected_first == "lumineux":
+        subset.loc[lumo.eq("lumineux"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (sat / 100.0) * 0.06
+
+    elif selected_first == "foncé":
+        subset.loc[clar.eq("foncé"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (noir / 100.0) * 0.08
+
+    elif selected_first == "clair":
+        subset.loc[clar.eq("clair"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - noir / 100.0) * 0.08
+
+    elif selected_first == "neutre":
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+
+    subset["alt_score"] = subset["score_1adj"] + subset["family_fit_bonus"]
+
+    subset = subset.sort_values(
+        by=["alt_score", "score_1adj", "score_global"],
+        ascending=[False, False, False]
+    )
+
+    subset = subset.drop_duplicates(subset=["ncs_code"])
+    return subset.head(top_n)
+
+# =========================
+# Écarts voulus
+# =========================
+# Changements de comportement délibérés, appliqués à la sortie de la
+# référence. Les vérifications comptent les entrées concernées (un écart
+# jamais exercé est une erreur) et exigent que le moteur les suive exactement.
+INTENDED_CHANGES = {
+    "casse": "codes NCS en minuscules acceptés (gris -> couleur)",
+    "teinte": "teinte non adjacente ou pourcentage nul refusés (couleur -> gris)",
+    "somme": "noirceur + chromaticité > 100 refusées (couleur -> gris)",
+    "lettre": "lettre de teinte hors R, G, B, Y refusée (couleur -> gris)",
+    "neutre teinté": "code « -N » à chromaticité non nulle refusé (nuance de gris -> gris)",
+    "neutre": "code NCS « -N » toujours gris, quel que soit son RGB",
+    "ex aequo": "à clés d'affichage égales, ordre du nuancier (et non l'ordre des notes)",
+}
+
+_GREY = (200, 200, 200)
+_NEXT_HUE = {"Y": "R", "R": "B", "B": "G", "G": "Y"}
+_CODE_SHAPE_RE = re.compile(r"^S(\d{2})(\d{2})-(?:N|([A-Z])(?:(\d{1,2})([A-Z]))?)$")
+
+def ncs_change(ncs_code):
+    """Écart voulu (clé d'INTENDED_CHANGES) qui touche la conversion de ce code, ou None."""
+    cleaned = (ncs_code or "").replace(" ", "")
+    m = _CODE_SHAPE_RE.match(cleaned.upper())
+    if not m:
+        return None
+
+    a, pct, b = m.group(3), m.group(4), m.group(5)
+    if a and not set(a + (b or "")) <= set(_NEXT_HUE):
+        change = "lettre"
+    elif int(m.group(1)) + int(m.group(2)) > 100:
+        change = "somme"
+    elif b and (_NEXT_HUE[a] != b or not 0 < int(pct) < 100):
+        change = "teinte"
+    elif a is None and int(m.group(2)) != 0:
+        change = "neutre teinté"
+    else:
+        change = None
+
+    if cleaned != cleaned.upper():
+        # L'ancienne expression refusait les minuscules : seul un code par ailleurs valide change
+        return "casse" if change is None else None
+    return change
+
+def intended_ncs_to_rgb(ncs_code):
+    change = ncs_change(ncs_code)
+    if change == "casse":
+        return reference_ncs_to_rgb(ncs_code.upper())
+    return _GREY if change else reference_ncs_to_rgb(ncs_code)
+
+def is_neutral_code(ncs_code) -> bool:
+    return re.match(r"^S\d{4}-N$", str(ncs_code).replace(" ", "").upper()) is not None
+
+def intended_color_family(ncs_code, rgb_tuple):
+    return "grey" if is_neutral_code(ncs_code) else reference_color_family_from_rgb(rgb_tuple)
+
+def report_changes(changes, required=()):
+    """Affiche le nombre d'entrées par écart voulu ; exige que chaque écart de `required` soit exercé."""
+    counts = pd.Series([c for c in changes if c], dtype=object).value_counts()
+    for change in required or counts.index:
+        print(f"  écart voulu « {change} » : {counts.get(change, 0):,} — {INTENDED_CHANGES[change]}")
+    missing = [c for c in required if not counts.get(c)]
+    if missing:
+        raise AssertionError(f"écart(s) voulu(s) jamais exercé(s) : {', '.join(missing)}")
+
+def reference_view(frame: pd.DataFrame, kind: str, adjectives) -> pd.DataFrame:
+    df_view = frame.copy()
+    if kind == "ncs":
+        df_view["rgb"] = df_view["ncs_code"].apply(reference_ncs_to_rgb)
+        df_view["hex"] = df_view["rgb"].apply(ncs.rgb_to_hex)
+    for i, adj in enumerate(adjectives, start=1):
+        df_view[f"s{i}"] = df_view.apply(lambda r: reference_score_adjective(r, adj), axis=1)
+    df_view["famille"] = [intended_color_family(c, rgb) for c, rgb in zip(df_view["ncs_code"], df_view["rgb"])]
+    return df_view
+
+def reference_strict(df_view: pd.DataFrame, threshold: float) -> pd.DataFrame:
+    df_view["score_global"] = (
+        1.0 * df_view["s1"] +
+        0.6 * df_view["s2"] +
+        0.3 * df_view["s3"]
+    ) + 0.05 * (df_view["saturation%"] / 100.0)
+
+    mask_strict = (
+        (df_view["s1"] >= threshold) &
+        (df_view["s2"] >= threshold) &
+        (df_view["s3"] >= threshold)
+    )
+    return df_view.loc[mask_strict].copy()
+
+def reference_weighted(df_view: pd.DataFrame, weights, threshold: float, k: int) -> pd.DataFrame:
+    raw = sum(w * df_view[f"s{i}"] for i, w in enumerate(weights, start=1))
+    total = sum(weights)
+    mean = raw / total if total > 0 else raw * 0.0
+    df_view["score_global"] = raw + 0.05 * (df_view["saturation%"] / 100.0)
+    result = df_view.loc[mean.round(SCORE_DECIMALS) >= threshold]
+    key = result["score_global"].round(SCORE_DECIMALS)
+    return result.loc[key.sort_values(ascending=False, kind="stable").index].head(k).copy()
+
+def reference_family_sort(result: pd.DataFrame) -> pd.DataFrame:
+    if result.empty:
+        # L'ancien code échouait ici (apply(pd.Series) sur une série vide)
+        return result.assign(groupe=pd.Series(dtype=object))
+    # Écart voulu « ex aequo » : le tri stable part de l'ordre du nuancier
+    result = result.sort_index()
+    result[["H", "S", "V"]] = result["rgb"].apply(ncs._rgb_to_hsv_tuple).apply(pd.Series)
+
+    ordered_chunks = []
+    for title, fam_set in PAGE_GROUPS:
+        df_group = result[result["famille"].isin(fam_set)].copy()
+        if df_group.empty:
+            continue
+
+        if fam_set == {"grey", "other"}:
+            df_group = df_group.sort_values(by=["V", "S"], ascending=[True, False]).reset_index(drop=True)
+        else:
+            df_group = df_group.sort_values(by=["H", "V", "S"], ascending=[True, True, False]).reset_index(drop=True)
+
+        df_group["groupe"] = title
+        ordered_chunks.append(df_group)
+
+    return pd.concat(ordered_chunks, ignore_index=True)
+
+def reference_pdf_layout(result: pd.DataFrame):
+    """Pages produites par l'ancien générateur PDF, relevées sur un vrai FPDF."""
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.set_font("Helvetica", size=9)
+    pages = []
+
+    left_margin, right_margin = 15, 15
+    usable_width = 210 - left_margin - right_margin
+    cols = 3
+    swatch_h = 25
+    gap_y = 10
+    swatch_w = usable_width / cols
+    start_y = 25
+    bottom_limit = 297 - 15
+
+    def add_page(title):
+        pdf.add_page()
+        pages.append((title, []))
+
+    def add_group_pages(page_title: str, df_page: pd.DataFrame):
+        add_page(page_title)
+
+        col = 0
+        x0 = left_margin
+        y = start_y
+
+        for _, row in df_page.iterrows():
+            needed = swatch_h + 3 + 10
+            if y + needed > bottom_limit:
+                add_page(f"{page_title} (suite)")
+                col = 0
+                y = start_y
+
+            x = x0 + col * swatch_w
+            pdf.rect(x, y, swatch_w, swatch_h, style="F")
+            pages[-1][1].append((row["ncs_code"], x, y))
+
+            pdf.set_xy(x, y + swatch_h + 3)
+            pdf.multi_cell(w=swatch_w, h=5, txt="", border=0, align="L")
+
+            col += 1
+            if col >= cols:
+                col = 0
+                y = pdf.get_y() + gap_y
+
+    for page_title, df_group in reference_family_sort(result).groupby("groupe", sort=False):
+        add_group_pages(page_title, df_group)
+    return pages
+
+# =========================
+# Moteurs (même enchaînement que colorimetrie.py)
+# =========================
+def engine_view(catalog: Catalog, adjectives) -> pd.DataFrame:
+    df_view = catalog.frame.copy()
+    adj_columns = [ADJECTIVES.index(a) for a in adjectives]
+    df_view[["s1", "s2", "s3"]] = catalog.scores[:, adj_columns]
+    df_view["famille"] = catalog.family_order.famille
+    df_view[["H", "S", "V"]] = catalog.family_order.hsv
+    return df_view
+
+def engine_strict(catalog: Catalog, df_view: pd.DataFrame, adjectives, threshold: float) -> pd.DataFrame:
+    selected, strict_score = select_strict(
+        catalog.scores, [ADJECTIVES.index(a) for a in adjectives], saturation_bonus(df_view), threshold
+    )
+    df_view["score_global"] = strict_score
+    return df_view.iloc[selected].copy()
+
+def engine_weighted(catalog: Catalog, df_view: pd.DataFrame, adjectives, weights, threshold, k):
+    ranked, weighted_score = rank_weighted(
+        catalog.scores, weight_vector(adjectives, weights), saturation_bonus(df_view), threshold, k
+    )
+    df_view["score_global"] = weighted_score
+    return df_view.iloc[ranked].copy()
+
+def engine_pdf_layout(result: pd.DataFrame):
+    codes = result["ncs_code"].to_numpy()
+    return [
+        (page.title, [(codes[row], x, y) for row, x, y in page.swatches])
+        for page in pdf_page_layout(result)
+    ]
+
+# =========================
+# Jeux de données
+# =========================
+RESULT_COLUMNS = ["ncs_code", "hex", "famille", "groupe", "s1", "s2", "s3", "score_global"]
+ALTERNATIVE_COLUMNS = ["ncs_code", "famille", "score_1adj", "family_fit_bonus", "alt_score", "score_global"]
+
+def catalogs():
+    """Nuanciers livrés + nuancier synthétique (codes NCS aléatoires, passés par le loader)."""
+    out = [Catalog(name, path, kind) for name, path, kind in SHIPPED]
+    tmp = Path(tempfile.mkdtemp(prefix="golden_")) / "synthetique.csv"
+    synthetic_catalog(SYNTHETIC_SIZE, seed=SEED).to_csv(tmp, sep=";", index=False)
+    out.append(Catalog("Nuancier synthétique", tmp, "ncs"))
+    return out
+
+def adjective_cases(rng: random.Random, n=CASES):
+    """Triplets d'adjectifs (doublons compris), seuils et poids aux pas des curseurs de l'app."""
+    steps = [round(0.05 * i, 2) for i in range(21)]
+    for _ in range(n):
+        yield (
+            tuple(rng.choice(ADJECTIVES) for _ in range(3)),
+            rng.choice(steps),
+            tuple(rng.choice(steps) for _ in range(3)),
+            rng.randrange(12, 361, 12),
+        )
+
+# =========================
+# Vérifications
+# =========================
+@golden
+def check_conversion(n=200_000):
+    shipped = pd.read_csv(SHIPPED[0][1], sep=";")["ncs_code"].tolist()
+    rng = random.Random(SEED)
+    codes = shipped + random_ncs_codes(n, seed=SEED, invalid_ratio=0.01, edge_ratio=0.02)
+    # Écritures avec espaces (« S 0550-G50Y »), acceptées par les deux implémentations
+    codes += [c[:1] + " " + c[1:] for c in rng.sample(codes, 1000)]
+    print(f"Conversion NCS -> RGB (approx) de {len(codes):,} codes")
+
+    clock = Stopwatch()
+    ncs._PARSED.clear()
+    ncs._ncs_code_to_rgb.cache_clear()
+    reference = clock.run("référence", lambda: [reference_ncs_to_rgb(c) for c in codes])
+    engine = clock.run("moteur", lambda: [ncs.ncs_to_rgb(c) for c in codes])
+
+    changes = [ncs_change(c) for c in codes]
+    report_changes(changes, required=("casse", "teinte", "somme", "lettre", "neutre teinté"))
+    expected = [intended_ncs_to_rgb(c) if ch else ref for c, ch, ref in zip(codes, changes, reference)]
+    unchanged = [c for c, ch, ref, exp in zip(codes, changes, reference, expected) if ch and ref == exp]
+    if unchanged:
+        raise AssertionError(f"écart voulu sans effet sur la référence, dont {unchanged[0]!r}")
+    assert_same("ncs_to_rgb", expected, engine)
+
+    valid = [c for c in codes if ncs.parse_ncs(c) is not None]
+    batch = ncs.ncs_codes_to_rgb([ncs.parse_ncs(c) for c in valid], "approx")
+    assert_same("ncs_codes_to_rgb", [intended_ncs_to_rgb(c) for c in valid], list(batch))
+    clock.report()
+
+@golden
+def check_scores():
+    for catalog in catalogs():
+        frame = catalog.frame
+        print(f"Notes et familles : {catalog.name} ({len(frame):,} couleurs)")
+        clock = Stopwatch()
+
+        reference = clock.run("référence", lambda: np.column_stack([
+            frame.apply(lambda r: reference_score_adjective(r, adj), axis=1).to_numpy() for adj in ADJECTIVES
+        ]))
+        engine = clock.run("moteur", adjective_score_matrix, frame)
+        assert_same("matrice des notes", reference, engine)
+
+        reference = clock.run("référence", lambda: np.array(
+            [reference_color_family_from_rgb(rgb) for rgb in frame["rgb"]], dtype=object
+        ))
+        order = clock.run("moteur", type(catalog.family_order), frame)
+        neutral = np.array([is_neutral_code(c) for c in frame["ncs_code"]], dtype=bool)
+        report_changes(np.where(neutral & (reference != "grey"), "neutre", None))
+        assert_same("familles", np.where(neutral, "grey", reference), order.famille)
+        hsv = np.array([ncs._rgb_to_hsv_tuple(rgb) for rgb in frame["rgb"]], dtype=np.float64).reshape(-1, 3)
+        assert_same("HSV", hsv, order.hsv)
+        clock.report()
+
+def _check_selection(mode):
+    # Mode pondéré : produit matrice-vecteur contre somme par ligne, les notes
+    # peuvent différer d'un arrondi ; l'ordre et les couleurs restent exigés à l'identique.
+    tolerance = 1e-12 if mode == "pondérée" else 0.0
+    rng = random.Random(SEED)
+    for catalog in catalogs():
+        print(f"Sélection {mode} : {catalog.name}, {CASES} cas")
+        clock = Stopwatch()
+        # Préparation par nuancier côté moteur (matrice des notes, ordre par familles)
+        clock.run("moteur", lambda: (catalog.scores, catalog.family_order))
+
+        for adjectives, threshold, weights, k in adjective_cases(rng):
+            case = f"{adjectives}, seuil {threshold}" + (f", poids {weights}, top {k}" if mode == "pondérée" else "")
+
+            ref_view = clock.run("référence", reference_view, catalog.frame, catalog.kind, adjectives)
+            eng_view = clock.run("moteur", engine_view, catalog, adjectives)
+            if mode == "stricte":
+                ref = clock.run("référence", reference_strict, ref_view, threshold)
+                eng = clock.run("moteur", engine_strict, catalog, eng_view, adjectives, threshold)
+            else:
+                ref = clock.run("référence", reference_weighted, ref_view, weights, threshold, k)
+                eng = clock.run("moteur", engine_weighted, catalog, eng_view, adjectives, weights, threshold, k)
+            ref = clock.run("référence", reference_family_sort, ref)
+            eng = clock.run("moteur", catalog.family_order.ordered, eng)
+            assert_same(f"résultat {case}", ref[RESULT_COLUMNS], eng[RESULT_COLUMNS], tolerance)
+
+            present = set(eng["famille"])
+            for family in ("red", "yellow"):
+                if family in present:
+                    continue
+                alt_ref = clock.run("référence", reference_best_family_alternatives, ref_view, [family], adjectives[0], threshold)
+                alt_eng = clock.run("moteur", best_family_alternatives, eng_view, [family], adjectives[0], threshold)
+                assert_same(f"alternatives {family} {case}",
+                            alt_ref.reindex(columns=ALTERNATIVE_COLUMNS), alt_eng.reindex(columns=ALTERNATIVE_COLUMNS),
+                            tolerance)
+
+            assert_same(f"pages PDF {case}",
+                        clock.run("référence", reference_pdf_layout, ref),
+                        clock.run("moteur", engine_pdf_layout, eng))
+        clock.report()
+
+@golden
+def check_strict():
+    _check_selection("stricte")
+
+@golden
+def check_weighted():
+    _check_selection("pondérée")
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(CHECKS)
+    failures = 0
+    for name in names:
+        try:
+            CHECKS[name]()
+        except AssertionError as exc:
+            failures += 1
+            print(f"  ÉCART ({name}) : {exc}")
+        except Exception:
+            failures += 1
+            traceback.print_exc()
+    print("Aucun écart." if not failures else f"{failures} vérification(s) en écart.")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Harmonies de couleurs (complémentaire, analogues, triadique) sur un résultat noté."""
+import numpy as np
+
+# Nom affiché -> décalages d'angle de teinte (degrés HSV)
+HARMONIES = {
+    "Complémentaire": (180.0,),
+    "Analogues": (-30.0, 30.0),
+    "Triadique": (-120.0, 120.0),
+}
+
+HUE_TOLERANCE = 15.0
+
+
+class HueIndex:
+    """Couleurs chromatiques d'un nuancier triées par angle de teinte.
+
+    Les teintes ne dépendent pas des adjectifs : l'index est calculé une fois
+    par nuancier. Chaque requête « meilleure note dans une fenêtre de teinte »
+    coûte deux recherches dichotomiques puis un argmax sur la seule fenêtre.
+    Le tableau est répété trois fois (h - 360, h, h + 360) pour que les
+    fenêtres qui traversent 0° restent contiguës.
+    """
+
+    def __init__(self, hue_deg, chromatic=None):
+        hue_deg = np.mod(np.asarray(hue_deg, dtype=np.float64), 360.0)
+        positions = np.arange(len(hue_deg))
+        if chromatic is not None:
+            keep = np.asarray(chromatic, dtype=bool)
+            hue_deg, positions = hue_deg[keep], positions[keep]
+
+        order = np.argsort(hue_deg, kind="stable")
+        self.size = len(order)
+        self.hues = np.concatenate([hue_deg[order] + shift for shift in (-360.0, 0.0, 360.0)])
+        self.positions = np.tile(positions[order], 3)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.hues.nbytes + self.positions.nbytes)
+
+    def best_in_windows(self, targets, scores, eligible=None, tolerance=HUE_TOLERANCE) -> np.ndarray:
+        """Position de la meilleure note à ±tolerance de chaque cible ; -1 si aucune.
+
+        `scores` et `eligible` (masque facultatif) sont indexés par position
+        dans le nuancier ; à note égale, la teinte la plus basse l'emporte.
+        """
+        targets = np.mod(np.asarray(targets, dtype=np.float64), 360.0)
+        out = np.full(targets.shape, -1, dtype=np.int64)
+        if self.size == 0:
+            return out
+
+        scores = np.asarray(scores, dtype=np.float64)
+        lo = np.searchsorted(self.hues, targets - tolerance, side="left")
+        hi = np.searchsorted(self.hues, targets + tolerance, side="right")
+        for idx in zip(*np.nonzero(hi > lo)):
+            window = self.positions[lo[idx]:hi[idx]]
+            if eligible is not None:
+                window = window[eligible[window]]
+            if len(window):
+                out[idx] = window[np.argmax(scores[window])]
+        return out
+
+    def suggest(self, source_hues, offsets, scores, eligible=None, tolerance=HUE_TOLERANCE) -> np.ndarray:
+        """Suggestions en lot : tableau (n_sources, n_décalages) de positions, -1 si aucune."""
+        source_hues = np.asarray(source_hues, dtype=np.float64).reshape(-1, 1)
+        targets = source_hues + np.asarray(offsets, dtype=np.float64).reshape(1, -1)
+        return self.best_in_windows(targets, scores, eligible, tolerance)
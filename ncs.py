@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""Codes NCS : analyse, validation et conversion vers RGB."""
+import re
+import sys
+import colorsys
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from colorspace import rgb_to_lab, lab_to_rgb
+
+# =========================
+# Analyse des codes NCS
+# =========================
+_NCS_RE = re.compile(r"^S(\d{2})(\d{2})-([RGBY](?:\d{1,2}[RGBY])?|N)$")
+_HUE_RE = re.compile(r"^([RGBY])(\d{1,2})([RGBY])$")
+
+# Sens du cercle NCS : Y -> R -> B -> G -> Y, un quart de tour par couleur élémentaire
+_HUE_ORIGIN = {"Y": 0.0, "R": 90.0, "B": 180.0, "G": 270.0}
+_NEXT_HUE = {"Y": "R", "R": "B", "B": "G", "G": "Y"}
+
+
+class NcsCode(NamedTuple):
+    blackness: int
+    chroma: int
+    hue: str
+    hue_angle: Optional[float]
+
+    @property
+    def whiteness(self) -> int:
+        return max(0, 100 - self.blackness - self.chroma)
+
+    @property
+    def is_neutral(self) -> bool:
+        return self.hue == "N"
+
+    def __str__(self):
+        return f"S{self.blackness:02d}{self.chroma:02d}-{self.hue}"
+
+
+def _hue_angle(hue: str):
+    if hue == "N":
+        return None
+    if hue in _HUE_ORIGIN:
+        return _HUE_ORIGIN[hue]
+    m = _HUE_RE.match(hue)
+    a, pct, b = m.group(1), int(m.group(2)), m.group(3)
+    if _NEXT_HUE[a] != b or not 0 < pct < 100:
+        return None
+    return _HUE_ORIGIN[a] + 90.0 * pct / 100.0
+
+
+def _parse_uncached(cleaned: str):
+    m = _NCS_RE.match(cleaned)
+    if not m:
+        return None
+
+    blackness, chroma, hue = int(m.group(1)), int(m.group(2)), m.group(3)
+    if blackness + chroma > 100:
+        return None
+    # Les gris neutres (« -N ») n'ont pas de chromaticité : « S0510-N » n'existe pas
+    if hue == "N" and chroma != 0:
+        return None
+
+    angle = _hue_angle(hue)
+    if angle is None and hue != "N":
+        return None
+    return NcsCode(blackness, chroma, sys.intern(hue), angle)
+
+
+# Table de mémoïsation : code brut -> NcsCode (ou None si invalide).
+# Les nuanciers répètent massivement les mêmes codes ; chaque code n'est analysé qu'une fois.
+_PARSED = {}
+_PARSED_MAX = 200_000
+
+def parse_ncs(ncs_code: str) -> Optional[NcsCode]:
+    """Analyse un code NCS (« S 0550-G50Y », « S0500-N »...) ; None s'il est invalide."""
+    try:
+        return _PARSED[ncs_code]
+    except (KeyError, TypeError):
+        pass
+
+    if not isinstance(ncs_code, str):
+        return None
+
+    parsed = _parse_uncached(ncs_code.replace(" ", "").upper())
+    if len(_PARSED) >= _PARSED_MAX:
+        _PARSED.clear()
+    _PARSED[sys.intern(ncs_code)] = parsed
+    return parsed
+
+
+class NcsValidationReport(NamedTuple):
+    parsed: list
+    invalid: list
+    duplicates: list
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid and not self.duplicates
+
+
+def validate_codes(codes) -> NcsValidationReport:
+    """Analyse tous les codes d'un nuancier et relève invalides et doublons (forme canonique)."""
+    parsed, invalid, duplicates = [], [], []
+    seen = set()
+    for code in codes:
+        p = parse_ncs(code)
+        parsed.append(p)
+        if p is None:
+            invalid.append(code)
+            continue
+        # Deux écritures d'un même code (« S 0550-G50Y », « S0550-G50Y ») donnent le même NcsCode
+        if p in seen:
+            duplicates.append(code)
+        seen.add(p)
+    return NcsValidationReport(parsed, invalid, duplicates)
+
+# =========================
+# Utils NCS -> RGB (approx)
+# =========================
+BASE = {
+    "R": (1.0, 0.0, 0.0),
+    "Y": (1.0, 1.0, 0.0),
+    "G": (0.0, 1.0, 0.0),
+    "B": (0.0, 0.0, 1.0),
+    "W": (1.0, 1.0, 1.0),
+    "S": (0.0, 0.0, 0.0),
+}
+
+def _mix(c1, c2, t):
+    return tuple((1 - t) * a + t * b for a, b in zip(c1, c2))
+
+def hue_to_rgb(hue: str):
+    if not hue or hue.upper() == "N":
+        return BASE["W"]
+
+    hue = hue.strip().upper()
+    if hue in BASE:
+        return BASE[hue]
+
+    m = _HUE_RE.match(hue)
+    if m:
+        a, pct, b = m.group(1), int(m.group(2)), m.group(3)
+        t = pct / 100.0
+        return _mix(BASE[a], BASE[b], t)
+
+    letters = [ch for ch in hue if ch in BASE]
+    if not letters:
+        return BASE["W"]
+
+    r = sum(BASE[ch][0] for ch in letters) / len(letters)
+    g = sum(BASE[ch][1] for ch in letters) / len(letters)
+    b = sum(BASE[ch][2] for ch in letters) / len(letters)
+    return (r, g, b)
+
+def ncs_to_rgb(ncs_code):
+    code = ncs_code if isinstance(ncs_code, NcsCode) else parse_ncs(ncs_code)
+    if code is None:
+        return (200, 200, 200)
+    return _ncs_code_to_rgb(code)
+
+@lru_cache(maxsize=65536)
+def _ncs_code_to_rgb(code: NcsCode):
+    blackness, chroma, hue = code.blackness, code.chroma, code.hue
+    whiteness = code.whiteness
+
+    hr, hg, hb = hue_to_rgb(hue)
+
+    r = (chroma / 100.0) * hr + (whiteness / 100.0) * BASE["W"][0] + (blackness / 100.0) * BASE["S"][0]
+    g = (chroma / 100.0) * hg + (whiteness / 100.0) * BASE["W"][1] + (blackness / 100.0) * BASE["S"][1]
+    b = (chroma / 100.0) * hb + (whiteness / 100.0) * BASE["W"][2] + (blackness / 100.0) * BASE["S"][2]
+
+    return (int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
+
+# =========================
+# NCS -> sRGB par table précalculée (aperçu à teintes lissées)
+# =========================
+# Table 3D (noirceur, chromaticité, angle de teinte) construite une fois à partir
+# des échantillons de REFERENCE_PATH (code NCS ; hex sRGB).
+# Modèle : chaque échantillon donne, par inversion du mélange NCS
+# blanc/noir/couleur pure dans CIELAB, la couleur pure de sa teinte ; les teintes
+# intermédiaires sont interpolées en LCh, puis W/S/C sont remélangés pour chaque
+# nœud de la grille.
+# Ce n'est PAS une conversion colorimétrique : les 8 échantillons livrés sont des
+# rendus écran approximatifs, sans source mesurée. Le mode ne fait que lisser les
+# teintes entre ces rendus ; c'est un aperçu, au même titre que « approx ».
+# Seule une table d'échantillons mesurés, de provenance indiquée, en ferait une
+# conversion fidèle.
+REFERENCE_PATH = Path(__file__).parent / "ncs_reference.csv"
+
+LUT_STEP = 5           # pas en noirceur et chromaticité (%)
+LUT_HUE_STEP = 5.0     # pas en angle de teinte (degrés NCS)
+
+CONVERSIONS = {
+    "approx": "Aperçu linéaire",
+    "lut": "Aperçu à teintes lissées (non colorimétrique)",
+}
+
+def _full_chroma_anchors(path):
+    ref = pd.read_csv(path, sep=";", dtype=str)
+    angles, labs = [], []
+    for code, hexcode in zip(ref["ncs_code"], ref["hex"]):
+        p = parse_ncs(code)
+        if p is None or p.is_neutral or p.chroma == 0:
+            raise ValueError(f"Échantillon de référence inutilisable : {code!r}")
+        lab = rgb_to_lab(np.array([hex_to_rgb(hexcode)]))[0]
+        c, w = p.chroma / 100.0, p.whiteness / 100.0
+        labs.append(((lab[0] - 100.0 * w) / c, lab[1] / c, lab[2] / c))
+        angles.append(p.hue_angle)
+
+    order = np.argsort(angles)
+    angles = np.asarray(angles, dtype=np.float64)[order]
+    labs = np.asarray(labs, dtype=np.float64)[order]
+
+    # Passage en LCh, angle Lab déroulé pour interpoler le long du cercle NCS
+    lum = labs[:, 0]
+    chroma = np.hypot(labs[:, 1], labs[:, 2])
+    hue = np.unwrap(np.arctan2(labs[:, 2], labs[:, 1]))
+
+    # Fermeture du cercle : le premier ancrage revient à +360°
+    turn = 2 * np.pi * np.sign(hue[-1] - hue[0]) if len(hue) > 1 else 2 * np.pi
+    angles = np.append(angles, angles[0] + 360.0)
+    lum = np.append(lum, lum[0])
+    chroma = np.append(chroma, chroma[0])
+    hue = np.append(hue, hue[0] + turn)
+    return angles, lum, chroma, hue
+
+@lru_cache(maxsize=4)
+def build_ncs_lut(path=REFERENCE_PATH) -> np.ndarray:
+    """Table (noirceur, chromaticité, teinte, RGB) en flottants 0-255."""
+    angles, lum, chroma, hue = _full_chroma_anchors(path)
+
+    s_axis = np.arange(0, 101, LUT_STEP, dtype=np.float64) / 100.0
+    c_axis = np.arange(0, 101, LUT_STEP, dtype=np.float64) / 100.0
+    h_axis = np.arange(0.0, 360.0 + LUT_HUE_STEP, LUT_HUE_STEP)
+
+    # Couleur pure interpolée pour chaque angle (origine des angles = premier ancrage)
+    h_rel = angles[0] + np.mod(h_axis - angles[0], 360.0)
+    h_rel[-1] = angles[0] + 360.0
+    full_l = np.interp(h_rel, angles, lum)
+    full_c = np.interp(h_rel, angles, chroma)
+    full_h = np.interp(h_rel, angles, hue)
+    full = np.stack([full_l, full_c * np.cos(full_h), full_c * np.sin(full_h)], axis=1)
+
+    s, c = np.meshgrid(s_axis, c_axis, indexing="ij")
+    c = np.minimum(c, 1.0 - s)        # nœuds hors triangle NCS : ramenés sur le bord
+    w = 1.0 - s - c
+
+    lab = (
+        c[:, :, None, None] * full[None, None, :, :]
+        + w[:, :, None, None] * np.array([100.0, 0.0, 0.0])
+    )
+    rgb = lab_to_rgb(lab.reshape(-1, 3))
+    return rgb.reshape(len(s_axis), len(c_axis), len(h_axis), 3)
+
+def ncs_lut_rgb(blackness, chroma, hue_angle, lut=None) -> np.ndarray:
+    """Interpolation trilinéaire vectorisée dans la table NCS -> (n, 3) uint8."""
+    lut = build_ncs_lut() if lut is None else lut
+    s = np.clip(np.asarray(blackness, dtype=np.float64) / LUT_STEP, 0, lut.shape[0] - 1)
+    c = np.clip(np.asarray(chroma, dtype=np.float64) / LUT_STEP, 0, lut.shape[1] - 1)
+    h = np.mod(np.nan_to_num(np.asarray(hue_angle, dtype=np.float64)), 360.0) / LUT_HUE_STEP
+
+    s0 = np.minimum(s.astype(int), lut.shape[0] - 2)
+    c0 = np.minimum(c.astype(int), lut.shape[1] - 2)
+    h0 = np.minimum(h.astype(int), lut.shape[2] - 2)
+    ds, dc, dh = (s - s0)[:, None], (c - c0)[:, None], (h - h0)[:, None]
+
+    out = np.zeros((len(s0), 3))
+    for i, wi in ((0, 1 - ds), (1, ds)):
+        for j, wj in ((0, 1 - dc), (1, dc)):
+            for k, wk in ((0, 1 - dh), (1, dh)):
+                out += wi * wj * wk * lut[s0 + i, c0 + j, h0 + k]
+    return np.rint(out).astype(np.uint8)
+
+def ncs_codes_to_rgb(codes, conversion="approx"):
+    """Liste de NcsCode -> liste de tuples RGB, selon le mode de conversion."""
+    if conversion == "approx":
+        return [_ncs_code_to_rgb(code) for code in codes]
+    if conversion != "lut":
+        raise ValueError(f"Mode de conversion inconnu : {conversion}")
+    if not codes:
+        return []
+
+    n = len(codes)
+    rgb = ncs_lut_rgb(
+        np.fromiter((c.blackness for c in codes), np.float64, n),
+        np.fromiter((c.chroma for c in codes), np.float64, n),
+        np.fromiter((c.hue_angle or 0.0 for c in codes), np.float64, n),
+    )
+    return list(map(tuple, rgb.tolist()))
+
+def rgb_to_hex(rgb):
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+def hex_to_rgb(hexcode: str):
+    h = (hexcode or "").strip().lstrip("#")
+    if len(h) != 6:
+        raise ValueError(f"Code HEX invalide : {hexcode!r}")
+    return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+
+def _rgb_to_hsv_tuple(rgb):
+    r, g, b = [c / 255.0 for c in rgb]
+    h, s, v = colorsys.rgb_to_hsv(r, g, b)
+    return (h, s, v)
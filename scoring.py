@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Notes d'adjectifs : fonction de référence par ligne, classement vectorisé et alternatives par famille."""
+import numpy as np
+import pandas as pd
+
+# Colonnes de la matrice de notes (adjectifs en minuscules, cf. ADJ_OPTIONS de l'app)
+ADJECTIVES = ["chaud", "froid", "clair", "foncé", "lumineux", "mat", "neutre"]
+
+def score_adjective(row: pd.Series, adj: str) -> float:
+    adj = (adj or "").strip().lower()
+    temp = (row.get("temperature") or "").strip().lower()
+    clar = (row.get("clarte") or "").strip().lower()
+    lumo = (row.get("luminosite") or "").strip().lower()
+    noir = float(row.get("noirceur%", 0))
+    sat = float(row.get("saturation%", 0))
+
+    if adj == "chaud":
+        return 1.0 if temp == "chaud" else (0.6 if temp == "neutre" else 0.0)
+
+    if adj == "froid":
+        return 1.0 if temp == "froid" else (0.6 if temp == "neutre" else 0.0)
+
+    if adj == "neutre":
+        base = 1.0 if temp == "neutre" else 0.0
+        bonus = max(0.0, (10.0 - sat) / 10.0)
+        return min(1.0, base + 0.6 * bonus)
+
+    if adj == "clair":
+        s = 1.0 - (noir / 100.0)
+        if clar == "clair":
+            s = min(1.0, s + 0.15)
+        return s
+
+    if adj == "foncé":
+        s = noir / 100.0
+        if clar == "foncé":
+            s = min(1.0, s + 0.15)
+        return s
+
+    if adj == "lumineux":
+        return 1.0 if lumo == "lumineux" else 0.3 + 0.7 * (sat / 100.0)
+
+    if adj == "mat":
+        return 1.0 if lumo == "mat" else 0.7 * (1.0 - sat / 100.0)
+
+    return 0.0
+
+def _text(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].fillna("").astype(str).str.strip().str.lower().to_numpy()
+
+def adjective_score_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Matrice (n, len(ADJECTIVES)) : mêmes valeurs que score_adjective, calculées par colonne."""
+    temp = _text(df, "temperature")
+    clar = _text(df, "clarte")
+    lumo = _text(df, "luminosite")
+    noir = df["noirceur%"].astype(float).to_numpy()
+    sat = df["saturation%"].astype(float).to_numpy()
+
+    neutral_temp = np.where(temp == "neutre", 0.6, 0.0)
+    clair = 1.0 - (noir / 100.0)
+    fonce = noir / 100.0
+
+    columns = {
+        "chaud": np.where(temp == "chaud", 1.0, neutral_temp),
+        "froid": np.where(temp == "froid", 1.0, neutral_temp),
+        "clair": np.where(clar == "clair", np.minimum(1.0, clair + 0.15), clair),
+        "foncé": np.where(clar == "foncé", np.minimum(1.0, fonce + 0.15), fonce),
+        "lumineux": np.where(lumo == "lumineux", 1.0, 0.3 + 0.7 * (sat / 100.0)),
+        "mat": np.where(lumo == "mat", 1.0, 0.7 * (1.0 - sat / 100.0)),
+        "neutre": np.minimum(
+            1.0,
+            np.where(temp == "neutre", 1.0, 0.0) + 0.6 * np.maximum(0.0, (10.0 - sat) / 10.0)
+        ),
+    }
+    return np.column_stack([columns[adj] for adj in ADJECTIVES])
+
+def saturation_bonus(df: pd.DataFrame) -> np.ndarray:
+    return 0.05 * (df["saturation%"].astype(float).to_numpy() / 100.0)
+
+# =========================
+# Mode strict
+# =========================
+STRICT_WEIGHTS = (1.0, 0.6, 0.3)
+
+def select_strict(matrix: np.ndarray, columns, bonus: np.ndarray, threshold: float):
+    """Positions dont les trois notes choisies atteignent le seuil, et note globale de chaque ligne."""
+    s1, s2, s3 = (matrix[:, c] for c in columns)
+    w1, w2, w3 = STRICT_WEIGHTS
+    score = (w1 * s1 + w2 * s2 + w3 * s3) + bonus
+    keep = (s1 >= threshold) & (s2 >= threshold) & (s3 >= threshold)
+    return np.flatnonzero(keep), score
+
+# =========================
+# Classement pondéré
+# =========================
+SCORE_DECIMALS = 9
+
+def weight_vector(adjectives, weights) -> np.ndarray:
+    """Poids par colonne de la matrice ; un adjectif choisi deux fois cumule ses poids."""
+    w = np.zeros(len(ADJECTIVES))
+    for adj, weight in zip(adjectives, weights):
+        w[ADJECTIVES.index((adj or "").strip().lower())] += weight
+    return w
+
+def rank_weighted(matrix: np.ndarray, w: np.ndarray, bonus: np.ndarray, threshold: float, k: int):
+    """Top-k par note pondérée, avec seuil souple sur la moyenne pondérée des notes.
+
+    Renvoie (positions triées par note décroissante, note de chaque ligne).
+    Seul le produit matrice-vecteur dépend des poids : aucune note d'adjectif
+    n'est recalculée quand les curseurs bougent.
+    """
+    raw = matrix @ w
+    total = w.sum()
+    mean = raw / total if total > 0 else np.zeros_like(raw)
+    score = raw + bonus
+    # Comparaisons à SCORE_DECIMALS près : l'ordre de sommation ne doit pas
+    # départager des notes égales (ex aequo : ordre du nuancier)
+    key = np.round(score, SCORE_DECIMALS)
+
+    candidates = np.flatnonzero(np.round(mean, SCORE_DECIMALS) >= threshold)
+    if len(candidates) > k:
+        kth = -np.partition(-key[candidates], k - 1)[k - 1]
+        above = candidates[key[candidates] > kth]
+        tied = candidates[key[candidates] == kth][:k - len(above)]
+        candidates = np.sort(np.concatenate([above, tied]))
+    order = candidates[np.argsort(-key[candidates], kind="stable")]
+    return order, score
+
+# =========================
+# Alternatives par famille (familles absentes du résultat)
+# =========================
+def best_family_alternatives(df_source: pd.DataFrame, family_names, first_adjective: str,
+                             threshold: float, top_n: int = 6) -> pd.DataFrame:
+    """Meilleures couleurs des familles demandées, d'après le 1er adjectif seulement.
+
+    `df_source` porte les colonnes s1 (note du 1er adjectif), famille et score_global.
+    """
+    if isinstance(family_names, str):
+        family_names = [family_names]
+
+    subset = df_source[df_source["famille"].isin(family_names)].copy()
+    if subset.empty:
+        return subset
+
+    # On se base uniquement sur le 1er adjectif
+    subset["score_1adj"] = subset["s1"]
+
+    # Filtre strict sur le 1er adjectif
+    subset = subset[subset["s1"] >= threshold].copy()
+
+    # Si c'est vide, on relâche un peu
+    if subset.empty:
+        relaxed_threshold = max(0.35, threshold - 0.20)
+        subset = df_source[df_source["famille"].isin(family_names)].copy()
+        subset["score_1adj"] = subset["s1"]
+        subset = subset[subset["s1"] >= relaxed_threshold].copy()
+
+    if subset.empty:
+        return subset
+
+    # Petit bonus léger pour mieux trier à l'intérieur,
+    # sans rendre les adjectifs 2 et 3 bloquants
+    temp = subset["temperature"].fillna("").astype(str).str.lower()
+    lumo = subset["luminosite"].fillna("").astype(str).str.lower()
+    clar = subset["clarte"].fillna("").astype(str).str.lower()
+    sat = subset["saturation%"].astype(float)
+    noir = subset["noirceur%"].astype(float)
+
+    subset["family_fit_bonus"] = 0.0
+
+    selected_first = first_adjective.lower()
+
+    if selected_first == "froid":
+        subset.loc[temp.eq("froid"), "family_fit_bonus"] += 0.15
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
+
+    elif selected_first == "chaud":
+        subset.loc[temp.eq("chaud"), "family_fit_bonus"] += 0.15
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.05
+
+    elif selected_first == "mat":
+        subset.loc[lumo.eq("mat"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+
+    elif selected_first == "lumineux":
+        subset.loc[lumo.eq("lumineux"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (sat / 100.0) * 0.06
+
+    elif selected_first == "foncé":
+        subset.loc[clar.eq("foncé"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (noir / 100.0) * 0.08
+
+    elif selected_first == "clair":
+        subset.loc[clar.eq("clair"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - noir / 100.0) * 0.08
+
+    elif selected_first == "neutre":
+        subset.loc[temp.eq("neutre"), "family_fit_bonus"] += 0.12
+        subset["family_fit_bonus"] += (1.0 - sat / 100.0) * 0.06
+
+    subset["alt_score"] = subset["score_1adj"] + subset["family_fit_bonus"]
+
+    subset = subset.sort_values(
+        by=["alt_score", "score_1adj", "score_global"],
+        ascending=[False, False, False]
+    )
+
+    subset = subset.drop_duplicates(subset=["ncs_code"])
+    return subset.head(top_n)
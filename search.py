@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Recherche plein texte dans un nuancier : index inversé + trie de préfixes."""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Colonnes indexées ; les adjectifs sont indexés comme des mots ordinaires
+TEXT_COLUMNS = ["nom", "teinte", "ncs_code", "temperature", "clarte", "luminosite"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# « S05 » : noirceur exacte ; « S10-30 » ou « S10-S30 » : plage de noirceur
+_BLACKNESS_RE = re.compile(r"^s(\d{1,2})(?:-s?(\d{1,2}))?$")
+# Code NCS écrit avec des espaces (« S 1050-Y90R ») : recollé comme dans parse_ncs
+_SPACED_CODE_RE = re.compile(r"\bs\s*(\d{2})\s*(\d{2})\s*-\s*([a-z0-9]+)")
+
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.5
+
+
+def fold(text) -> str:
+    """Minuscules sans accents (« Foncé » -> « fonce »)."""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(fold(text))
+
+
+class PrefixTrie:
+    _END = "$"
+
+    def __init__(self, words=()):
+        self.root = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[self._END] = word
+
+    def expand(self, prefix: str):
+        """Tous les mots de l'index commençant par `prefix`."""
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        words, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == self._END:
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return words
+
+
+class SearchIndex:
+    """Index construit une fois par nuancier ; les positions sont celles du DataFrame source."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.size = len(frame)
+        postings = {}
+        for col in TEXT_COLUMNS:
+            if col not in frame.columns:
+                continue
+            # Tokenisation des valeurs distinctes seulement, puis positions groupées par valeur
+            codes, uniques = pd.factorize(frame[col], use_na_sentinel=False)
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(uniques)))])
+            for k, value in enumerate(uniques):
+                rows = order[bounds[k]:bounds[k + 1]]
+                for token in set(tokenize(value)):
+                    postings.setdefault(token, []).append(rows)
+
+        self.postings = {
+            token: np.unique(np.concatenate(chunks))
+            for token, chunks in postings.items()
+        }
+        self.trie = PrefixTrie(self.postings)
+        self.blackness = frame["noirceur%"].astype(float).to_numpy()
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(p.nbytes for p in self.postings.values()) + self.blackness.nbytes)
+
+    def _term_relevance(self, term: str) -> np.ndarray:
+        relevance = np.zeros(self.size)
+
+        m = _BLACKNESS_RE.match(term)
+        if m:
+            low = int(m.group(1))
+            high = int(m.group(2)) if m.group(2) else low
+            low, high = min(low, high), max(low, high)
+            relevance[(self.blackness >= low) & (self.blackness <= high)] = EXACT_WEIGHT
+            # Noirceur exacte : pas d'expansion de préfixe (« S5 » ne vaut pas S50, S55)
+            return relevance
+
+        for token in self.trie.expand(term):
+            weight = EXACT_WEIGHT if token == term else PREFIX_WEIGHT
+            hits = self.postings[token]
+            relevance[hits] = np.maximum(relevance[hits], weight)
+        return relevance
+
+    def query(self, text: str):
+        """Positions correspondant à tous les termes, et leur pertinence.
+
+        Chaque terme est une plage de noirceur (« S05 », « S10-30 ») ou un
+        préfixe de mot du nom, de la teinte, du code ou des adjectifs.
+        """
+        text = _SPACED_CODE_RE.sub(lambda m: f"s{m.group(1)}{m.group(2)}-{m.group(3)}", fold(text))
+        terms = [t for t in re.split(r"[\s,;]+", text.strip()) if t]
+        if not terms:
+            return np.arange(self.size), np.zeros(self.size)
+
+        total = np.zeros(self.size)
+        matched = np.ones(self.size, dtype=bool)
+        for term in terms:
+            # Un terme composé (« jaune-vert ») se lit comme ses mots successifs
+            parts = [term] if _BLACKNESS_RE.match(term) else _TOKEN_RE.findall(term)
+            for part in parts:
+                relevance = self._term_relevance(part)
+                matched &= relevance > 0
+                total += relevance
+
+        positions = np.flatnonzero(matched)
+        return positions, total[positions]
+
+
+def rank_results(positions, relevance, scores) -> np.ndarray:
+    """Tri par pertinence décroissante, puis note globale décroissante."""
+    scores = np.asarray(scores, dtype=np.float64)[positions]
+    return positions[np.lexsort((-scores, -relevance))]
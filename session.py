@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Gestion bornée de st.session_state : clés de widgets par emplacement et ramasse-miettes."""
+import pickle
+import sys
+
+WIDGET_PREFIX = "w:"
+
+
+def _approx_size(value) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class SessionStateManager:
+    """Clés de widgets gérées pour un passage (rerun) du script.
+
+    Les clés sont dérivées de l'emplacement à l'écran (bloc + index), jamais du
+    contenu affiché : leur nombre est borné par la taille de la page, quelle que
+    soit la navigation. En fin de passage, collect_garbage() supprime les clés
+    gérées qui n'ont pas été utilisées.
+    """
+
+    def __init__(self, state, max_widget_keys: int = 256):
+        self.state = state
+        self.max_widget_keys = max_widget_keys
+        self._used = set()
+
+    def widget_key(self, *parts) -> str:
+        key = WIDGET_PREFIX + "_".join(str(p) for p in parts)
+        if key not in self._used and len(self._used) >= self.max_widget_keys:
+            raise RuntimeError(f"Trop de widgets gérés dans un même passage (> {self.max_widget_keys})")
+        self._used.add(key)
+        return key
+
+    def remember(self, name: str, value) -> bool:
+        """Stocke un identifiant compact ; True si la valeur a changé depuis le passage précédent."""
+        changed = self.state.get(name) != value
+        if changed:
+            self.state[name] = value
+        return changed
+
+    def collect_garbage(self) -> int:
+        stale = [
+            key for key in list(self.state.keys())
+            if isinstance(key, str) and key.startswith(WIDGET_PREFIX) and key not in self._used
+        ]
+        for key in stale:
+            del self.state[key]
+        return len(stale)
+
+    def memory_report(self) -> dict:
+        keys = list(self.state.keys())
+        return {
+            "clés": len(keys),
+            "widgets gérés": sum(1 for k in keys if isinstance(k, str) and k.startswith(WIDGET_PREFIX)),
+            "octets": sum(_approx_size(self.state[k]) for k in keys),
+        }